@@ -0,0 +1,123 @@
+"""
+Result caches for Gemini-backed pipeline stages.
+
+`dedupe_inflight` coalesces identical concurrent calls so that only one of them
+reaches Gemini; the others await the same task.
+
+Completed results are stored as JSON files under ``~/.cache/frar/<stage>/`` (override the
+root with the ``FRAR_CACHE_DIR`` environment variable). Keys are derived from the
+company name, the current financial year and the prompt template, so editing a
+prompt automatically invalidates every entry produced by the old one.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import time
+from pathlib import Path
+from typing import Any, Dict, Hashable, Optional
+
+from agents._env import cache_dir
+from tools.financial_year import get_current_financial_year
+
+logger = logging.getLogger(__name__)
+
+# Default time-to-live for cached stage results (one day)
+DEFAULT_TTL = 86400
+
+# Tasks currently running for a given key, shared by concurrent callers
+_inflight: Dict[Hashable, asyncio.Task] = {}
+
+
+async def dedupe_inflight(key: Hashable, func, *args, **kwargs) -> Any:
+    """
+    Runs `func(*args, **kwargs)` once per key among concurrent callers.
+
+    A second caller arriving while the first call for the same key is still
+    running awaits the existing task instead of issuing a duplicate request.
+
+    Args:
+        key (Hashable): Identity of the request, e.g. (stage, company, financial year).
+        func: The async function to call.
+
+    Returns:
+        Any: Result of the (possibly shared) call.
+    """
+    task = _inflight.get(key)
+    if task is None:
+        task = asyncio.ensure_future(func(*args, **kwargs))
+        _inflight[key] = task
+        task.add_done_callback(lambda _: _inflight.pop(key, None))
+    # Shield so that one caller being cancelled does not cancel the others
+    return await asyncio.shield(task)
+
+
+def stage_cache_key(stage: str, company_name: str, template: str) -> str:
+    """
+    Builds a stable cache key for a pipeline stage.
+
+    Args:
+        stage (str): Stage name, e.g. "risk" or "esg".
+        company_name (str): Target company name.
+        template (str): Prompt template used by the stage.
+
+    Returns:
+        str: Hex digest identifying the (company, financial year, prompt) triple.
+    """
+    payload = json.dumps(
+        [stage, company_name.strip().lower(), get_current_financial_year(), template],
+        ensure_ascii=False,
+    )
+    return hashlib.blake2b(payload.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def _entry_path(stage: str, key: str) -> Path:
+    return cache_dir() / stage / f"{key}.json"
+
+
+def cache_get(stage: str, key: str) -> Optional[Any]:
+    """
+    Returns a cached value if present and not expired.
+
+    Args:
+        stage (str): Stage name the key belongs to.
+        key (str): Key produced by `stage_cache_key`.
+
+    Returns:
+        Optional[Any]: The cached value, or None on a miss.
+    """
+    path = _entry_path(stage, key)
+    try:
+        entry = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    if entry.get("expires_at", 0) < time.time():
+        return None
+    return entry.get("value")
+
+
+def cache_set(stage: str, key: str, value: Any, expire: int = DEFAULT_TTL) -> None:
+    """
+    Stores a JSON-serializable value in the cache.
+
+    Write failures are logged and ignored; the cache is an optimization only.
+
+    Args:
+        stage (str): Stage name the key belongs to.
+        key (str): Key produced by `stage_cache_key`.
+        value (Any): JSON-serializable value to store.
+        expire (int): Time-to-live in seconds.
+    """
+    path = _entry_path(stage, key)
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(f".{os.getpid()}.tmp")
+        tmp.write_text(
+            json.dumps({"expires_at": time.time() + expire, "value": value}, ensure_ascii=False),
+            encoding="utf-8",
+        )
+        tmp.replace(path)
+    except OSError as e:
+        logger.warning("⚠️ Failed to write cache entry %s: %s", path, e)
@@ -0,0 +1,40 @@
+"""
+Process environment shared by the backend and the Streamlit UI.
+
+`.env` is loaded by `ensure_env`, once per process, on the first call that needs
+a setting rather than as a side effect of importing any module. Settings read
+from the environment go through helpers here so that a `.env` override is
+always visible to them.
+"""
+
+import os
+from functools import lru_cache
+from pathlib import Path
+
+from dotenv import load_dotenv
+
+
+@lru_cache(maxsize=1)
+def ensure_env() -> bool:
+    """
+    Loads variables from `.env` into the environment, at most once per process.
+
+    Returns:
+        bool: Always True, so the call can be cached.
+    """
+    load_dotenv()
+    return True
+
+
+def cache_dir() -> Path:
+    """
+    Returns the root directory for on-disk caches.
+
+    Defaults to ``~/.cache/frar``; override it with the ``FRAR_CACHE_DIR``
+    environment variable (or the same key in `.env`).
+
+    Returns:
+        Path: The cache root (not created here).
+    """
+    ensure_env()
+    return Path(os.getenv("FRAR_CACHE_DIR", Path.home() / ".cache" / "frar"))
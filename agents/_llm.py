@@ -0,0 +1,109 @@
+"""
+Shared Gemini chat model for the pipeline agents.
+
+Constructing `ChatGoogleGenerativeAI` creates its own API clients and auth state,
+so every agent module uses the single instance returned by `get_gemini_flash`
+instead of building its own. Model configuration (name, timeout) lives in one place.
+
+`.env` is loaded by `agents._env.ensure_env` on the first call that needs it
+(building a model or a rate limiter) rather than as a side effect of importing
+any module.
+
+Setting `GOOGLE_API_KEYS` to a comma-separated list of keys (one per Gemini
+project) makes `gemini_models` return one model per key, which
+`agents._pool.AgentPool` round-robins to multiply the available quota. Each
+model meters its own requests against its key's limiter (`key_limiter`).
+"""
+
+import os
+from contextvars import ContextVar
+from functools import lru_cache
+from typing import List, Optional
+
+from langchain_google_genai import ChatGoogleGenerativeAI  # type: ignore
+
+from agents._env import ensure_env
+from agents._rate_limit import AsyncLimiter, ModelRateLimiter, get_limiter
+
+# Gemini model used by every agent
+MODEL_NAME = "gemini-2.5-flash"
+
+# Per-request timeout (seconds) for Gemini calls
+REQUEST_TIMEOUT = 60
+
+# Index into `gemini_api_keys()` of the key serving the current agent run. Set by
+# `AgentPool.acquire`; tools called from the agent (e.g. grounded search) read it
+# so their own Gemini requests bill the same project.
+ACTIVE_KEY_INDEX: ContextVar[int] = ContextVar("gemini_key_index", default=0)
+
+
+def key_limiter(index: int) -> AsyncLimiter:
+    """
+    Returns the rate limiter for the API key at `index` in `gemini_api_keys()`.
+
+    The default key keeps the plain model-name limiter used elsewhere.
+
+    Args:
+        index (int): Position of the key.
+
+    Returns:
+        AsyncLimiter: The process-wide limiter for that key's project.
+    """
+    return get_limiter(MODEL_NAME if index == 0 else f"{MODEL_NAME}#{index}")
+
+
+@lru_cache(maxsize=1)
+def gemini_api_keys() -> List[Optional[str]]:
+    """
+    Returns the configured Gemini API keys, the default `GOOGLE_API_KEY` first.
+
+    Additional keys come from `GOOGLE_API_KEYS`; duplicates of the default are skipped.
+
+    Returns:
+        List[Optional[str]]: Keys in order (the default may be None if unset).
+    """
+    ensure_env()
+    default_key = os.getenv("GOOGLE_API_KEY")
+    extra_keys = [
+        key.strip() for key in os.getenv("GOOGLE_API_KEYS", "").split(",")
+        if key.strip() and key.strip() != default_key
+    ]
+    return [default_key] + extra_keys
+
+
+def _build_model(index: int) -> ChatGoogleGenerativeAI:
+    # Every request the model makes, including each ReAct step, takes a token
+    kwargs = {"google_api_key": gemini_api_keys()[index]} if index else {}
+    return ChatGoogleGenerativeAI(
+        model=MODEL_NAME,
+        timeout=REQUEST_TIMEOUT,
+        rate_limiter=ModelRateLimiter(key_limiter(index)),
+        **kwargs,
+    )
+
+
+@lru_cache(maxsize=1)
+def get_gemini_flash() -> ChatGoogleGenerativeAI:
+    """
+    Returns the shared chat model for the default `GOOGLE_API_KEY`, built on first use.
+
+    Returns:
+        ChatGoogleGenerativeAI: The process-wide model instance.
+    """
+    return _build_model(0)
+
+
+@lru_cache(maxsize=1)
+def gemini_models() -> List[ChatGoogleGenerativeAI]:
+    """
+    Returns one shared chat model per configured Gemini API key.
+
+    The first entry is always `get_gemini_flash()` (the default `GOOGLE_API_KEY`);
+    additional keys from `GOOGLE_API_KEYS` get their own model, built once.
+
+    Returns:
+        List[ChatGoogleGenerativeAI]: Models in `gemini_api_keys()` order.
+    """
+    return [get_gemini_flash()] + [
+        _build_model(index) for index in range(1, len(gemini_api_keys()))
+    ]
@@ -0,0 +1,96 @@
+"""
+Pool of preconfigured ReAct agents, one per Gemini API key.
+
+Each member pairs an agent compiled once around its own chat model with the
+rate limiter for that key's project. The model takes a token from that limiter
+for every request it makes, so quota is enforced per project and per call
+rather than per agent run. Tools the agent calls (grounded search) use the
+member's key too. `acquire` hands out members round-robin:
+
+    >>> async with RISK_POOL.acquire() as member:
+    ...     await member.agent.ainvoke(payload)
+
+Compiled LangGraph agents are reentrant, so a member can serve several
+concurrent calls; request rate is bounded by each limiter rather than by the
+pool size.
+"""
+
+import itertools
+import threading
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Callable, Iterator, List, NamedTuple, Optional
+
+from agents._llm import ACTIVE_KEY_INDEX, gemini_models, key_limiter
+from agents._rate_limit import AsyncLimiter
+
+
+class PooledAgent(NamedTuple):
+    """
+    One pool member.
+
+    Attributes:
+        agent (Any): Compiled agent bound to one API key.
+        limiter (AsyncLimiter): Rate limiter for that key's project.
+        key_index (int): Position of the key in `gemini_api_keys()`.
+    """
+    agent: Any
+    limiter: AsyncLimiter
+    key_index: int
+
+
+class AgentPool:
+    """
+    Lazily builds one agent per configured Gemini model and hands them out round-robin.
+
+    Args:
+        factory (Callable[[Any], Any]): Builds an agent around a chat model,
+            e.g. `lambda model: create_react_agent(model=model, ...)`.
+    """
+
+    def __init__(self, factory: Callable[[Any], Any]):
+        self._factory = factory
+        self._members: Optional[List[PooledAgent]] = None
+        self._cursor: Optional[Iterator[PooledAgent]] = None
+        self._lock = threading.Lock()
+
+    @property
+    def members(self) -> List[PooledAgent]:
+        """
+        Returns the pool members, building them on first access.
+        """
+        with self._lock:
+            if self._members is None:
+                self._members = [
+                    PooledAgent(
+                        agent=self._factory(model),
+                        limiter=key_limiter(index),
+                        key_index=index,
+                    )
+                    for index, model in enumerate(gemini_models())
+                ]
+                self._cursor = itertools.cycle(self._members)
+            return self._members
+
+    def _next(self) -> PooledAgent:
+        self.members  # ensure built
+        with self._lock:
+            return next(self._cursor)  # type: ignore[arg-type]
+
+    @asynccontextmanager
+    async def acquire(self) -> AsyncIterator[PooledAgent]:
+        """
+        Picks the next member for the caller to use.
+
+        No permit is held here: the member's model takes one from its limiter
+        for each request it makes. While the block runs, `ACTIVE_KEY_INDEX`
+        points at the member's key so that tools use the same project.
+
+        Yields:
+            PooledAgent: The agent to call and its limiter (e.g. to `penalize` on a 429).
+        """
+        member = self._next()
+        token = ACTIVE_KEY_INDEX.set(member.key_index)
+        try:
+            yield member
+        finally:
+            ACTIVE_KEY_INDEX.reset(token)
@@ -0,0 +1,208 @@
+"""
+Proactive client-side rate limiting for Gemini calls.
+
+One limiter per Gemini model and API key, sized to that model's per-minute
+request quota, is shared by every stage of the pipeline so that the quota is
+enforced per project rather than per agent. Every model request takes one
+token: chat models through LangChain's `rate_limiter` hook (`ModelRateLimiter`),
+including each step of a ReAct loop, and grounded searches by entering the
+limiter around their Gemini call. Waiting for a token up front is much cheaper
+than hitting a 429 and paying the server-imposed backoff.
+
+Each limiter combines:
+    - a token bucket refilling at `max_rate / time_period` permits per second,
+    - an optional cap on concurrent in-flight calls (`max_concurrency`), held
+      by `async with` users for the duration of one request,
+    - a penalty window: after a 429, `penalize(retry_delay)` pauses every
+      caller until the server-suggested delay has elapsed.
+
+The quota defaults to the free tier (15 requests per minute, 4 concurrent
+calls) and can be changed with the `GEMINI_RPM` and `GEMINI_MAX_CONCURRENCY`
+environment variables.
+"""
+
+import asyncio
+import os
+import threading
+import time
+import weakref
+from typing import Dict, Optional
+
+from langchain_core.rate_limiters import BaseRateLimiter
+
+from agents._env import ensure_env
+
+
+class AsyncLimiter:
+    """
+    Token bucket permitting `max_rate` acquisitions per `time_period` seconds.
+
+    The bucket starts full, so short bursts up to `max_rate` go through
+    immediately. Bookkeeping is guarded by a `threading.Lock` (never held across
+    an await), which makes the limiter safe to share between event loops and
+    worker threads. The concurrency cap applies to `async with` users only.
+
+    Usage:
+        >>> async with limiter:
+        ...     await agent.ainvoke(payload)
+    """
+
+    def __init__(
+        self,
+        max_rate: float,
+        time_period: float = 60.0,
+        max_concurrency: Optional[int] = None,
+        permit_timeout: Optional[float] = None,
+    ):
+        self.max_rate = max_rate
+        self.time_period = time_period
+        self.max_concurrency = max_concurrency
+        self.permit_timeout = permit_timeout
+        self._refill_per_second = max_rate / time_period
+        self._tokens = float(max_rate)
+        self._last_refill = time.monotonic()
+        self._blocked_until = 0.0
+        self._lock = threading.Lock()
+        # asyncio.Semaphore is bound to one event loop, so keep one per loop
+        self._semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = (
+            weakref.WeakKeyDictionary()
+        )
+
+    def _try_acquire(self) -> float:
+        """
+        Takes a token if one is available.
+
+        Returns:
+            float: 0 if a token was taken, otherwise seconds until one is available.
+        """
+        with self._lock:
+            now = time.monotonic()
+            if now < self._blocked_until:
+                return self._blocked_until - now
+            elapsed = now - self._last_refill
+            self._tokens = min(self.max_rate, self._tokens + elapsed * self._refill_per_second)
+            self._last_refill = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return 0.0
+            return (1 - self._tokens) / self._refill_per_second
+
+    def penalize(self, seconds: float) -> None:
+        """
+        Pauses all acquisitions for `seconds`, e.g. after a 429 from Gemini.
+
+        The bucket is also drained so that callers resume gradually at the
+        refill rate instead of bursting straight back into the quota.
+
+        Args:
+            seconds (float): How long to hold every caller back.
+        """
+        with self._lock:
+            self._blocked_until = max(self._blocked_until, time.monotonic() + seconds)
+            self._tokens = 0.0
+            # Refill from the end of the block, not across it
+            self._last_refill = self._blocked_until
+
+    async def acquire(self, timeout: Optional[float] = None) -> None:
+        """
+        Waits asynchronously until a token is available, then takes it.
+
+        Args:
+            timeout (Optional[float]): Maximum seconds to wait; defaults to
+                `permit_timeout`. None waits indefinitely.
+
+        Raises:
+            asyncio.TimeoutError: If no token became available in time.
+        """
+        timeout = self.permit_timeout if timeout is None else timeout
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while (wait := self._try_acquire()) > 0:
+            if deadline is not None and time.monotonic() + wait > deadline:
+                raise asyncio.TimeoutError(f"No rate limit permit within {timeout}s")
+            await asyncio.sleep(wait)
+
+    def _semaphore(self) -> Optional[asyncio.Semaphore]:
+        if self.max_concurrency is None:
+            return None
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            semaphore = self._semaphores.get(loop)
+            if semaphore is None:
+                semaphore = self._semaphores[loop] = asyncio.Semaphore(self.max_concurrency)
+        return semaphore
+
+    async def __aenter__(self) -> "AsyncLimiter":
+        semaphore = self._semaphore()
+        if semaphore is not None:
+            await semaphore.acquire()
+        try:
+            await self.acquire()
+        except BaseException:
+            if semaphore is not None:
+                semaphore.release()
+            raise
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        semaphore = self._semaphore()
+        if semaphore is not None:
+            semaphore.release()
+        return None
+
+
+class ModelRateLimiter(BaseRateLimiter):
+    """
+    Adapts an `AsyncLimiter` to LangChain's `rate_limiter=` hook.
+
+    Chat models call the hook once per request, so passing this to
+    `ChatGoogleGenerativeAI` meters every model call, not just the top-level
+    agent invocation. Only the token bucket applies; the hook has no release
+    step for the concurrency cap.
+
+    Args:
+        limiter (AsyncLimiter): The limiter to take tokens from.
+    """
+
+    def __init__(self, limiter: AsyncLimiter):
+        self.limiter = limiter
+
+    def acquire(self, *, blocking: bool = True) -> bool:
+        while (wait := self.limiter._try_acquire()) > 0:
+            if not blocking:
+                return False
+            time.sleep(wait)
+        return True
+
+    async def aacquire(self, *, blocking: bool = True) -> bool:
+        if not blocking:
+            return self.limiter._try_acquire() == 0.0
+        await self.limiter.acquire()
+        return True
+
+
+# One limiter per Gemini model, shared process-wide
+_LIMITERS: Dict[str, AsyncLimiter] = {}
+_LIMITERS_LOCK = threading.Lock()
+
+
+def get_limiter(model: str) -> AsyncLimiter:
+    """
+    Returns the process-wide limiter for a Gemini model, creating it on first use.
+
+    Args:
+        model (str): Gemini model name, e.g. "gemini-2.5-flash".
+
+    Returns:
+        AsyncLimiter: The limiter shared by every caller of that model.
+    """
+    with _LIMITERS_LOCK:
+        limiter = _LIMITERS.get(model)
+        if limiter is None:
+            ensure_env()  # GEMINI_RPM / GEMINI_MAX_CONCURRENCY may come from .env
+            limiter = _LIMITERS[model] = AsyncLimiter(
+                max_rate=float(os.getenv("GEMINI_RPM", "15")),
+                time_period=60,
+                max_concurrency=int(os.getenv("GEMINI_MAX_CONCURRENCY", "4")),
+            )
+        return limiter
+
@@ -0,0 +1,184 @@
+"""
+Shared retry policy for Gemini-backed calls.
+
+Every stage of the pipeline (financial risk, ESG and knowledge graph) uses the
+same policy: capped exponential backoff with jitter, where a server-suggested
+`retry_delay` from a ResourceExhausted error overrides the exponential step but
+is still clamped to `MAX_RETRY_WAIT`.
+
+Errors are classified before retrying: a per-minute rate limit is transient and
+worth waiting for, while exhausted daily quota will not recover within any
+sensible backoff window, so callers fail fast on it.
+
+Exports:
+    - is_retryable: Whether an error is a transient rate limit.
+    - parse_retry_delay: Extract the server-suggested delay from an error.
+    - retry_wait_time: Jittered, capped sleep before a given retry attempt.
+    - async_retry: Retry a coroutine function on ResourceExhausted.
+    - retry_delay_wait: `backoff` wait generator honoring `retry_delay`.
+    - rate_limit_backoff: `backoff` decorator with the same bounds.
+
+Convention: async code in this package that only needs to yield control to the
+event loop (e.g. between categories) uses `await asyncio.sleep(0)`, which
+CPython short-circuits, rather than a tiny positive delay. Positive sleeps are
+reserved for real backoff or pacing waits.
+"""
+
+import asyncio
+import logging
+import random
+import re
+from typing import Optional
+
+import backoff  # type: ignore
+from google.api_core.exceptions import ResourceExhausted
+
+from agents._llm import MODEL_NAME
+from agents._rate_limit import get_limiter
+
+logger = logging.getLogger(__name__)
+
+# Maximum number of attempts (including the first) for any Gemini call
+MAX_TRIES = 6
+
+# Upper bound (seconds) for any single backoff sleep, server-suggested or not
+MAX_RETRY_WAIT = 30
+
+# Upper bound (seconds) for the total time spent retrying a single call
+MAX_RETRY_TIME = 180
+
+# Pattern for the retry delay embedded in Gemini ResourceExhausted messages, in
+# either the protobuf text form (`retry_delay { seconds: 12 }`) or the JSON
+# form (`"retryDelay": "12s"`); one alternation keeps it to a single scan
+_RETRY_RE = re.compile(r"retry_delay\s*{\s*seconds:\s*(\d+)|[\"']retryDelay[\"']\s*:\s*[\"'](\d+)(?:\.\d+)?s")
+
+# Markers of a daily (non-recoverable within the run) quota violation, e.g.
+# quota_id "GenerateRequestsPerDayPerProjectPerModel-FreeTier"
+_DAILY_QUOTA_RE = re.compile(r"PerDay|per[ _-]day|daily", re.IGNORECASE)
+
+
+def is_retryable(e: Exception) -> bool:
+    """
+    Decides whether a Gemini error is a transient rate limit worth retrying.
+
+    Args:
+        e (Exception): The caught exception.
+
+    Returns:
+        bool: True for per-minute ResourceExhausted errors, False for daily
+            quota exhaustion and any other error type.
+    """
+    if not isinstance(e, ResourceExhausted):
+        return False
+    return _DAILY_QUOTA_RE.search(str(e)) is None
+
+
+def parse_retry_delay(e: Exception) -> Optional[int]:
+    """
+    Extracts the retry delay in seconds from a Gemini API ResourceExhausted error.
+
+    Args:
+        e (Exception): The caught exception.
+
+    Returns:
+        Optional[int]: The parsed number of seconds to wait, or None if absent.
+    """
+    match = _RETRY_RE.search(str(e))
+    if match:
+        return int(match.group(1) or match.group(2))
+    return None
+
+
+def _half_jitter(value: float) -> float:
+    """
+    Scales a delay into [value / 2, value] so concurrent retries spread out
+    without undercutting a server-suggested delay by more than half.
+    """
+    return value * random.uniform(0.5, 1.0)
+
+
+def retry_wait_time(e: Exception, attempt: int) -> float:
+    """
+    Computes the jittered, capped sleep before the next attempt.
+
+    Args:
+        e (Exception): The rate limit error that triggered the retry.
+        attempt (int): Zero-based index of the failed attempt.
+
+    Returns:
+        float: Seconds to sleep.
+    """
+    retry_seconds = parse_retry_delay(e)
+    return _half_jitter(min(retry_seconds or (2 ** attempt), MAX_RETRY_WAIT))
+
+
+async def async_retry(func, *args, max_retries=MAX_TRIES, **kwargs):
+    """
+    Asynchronously retries a coroutine on ResourceExhausted errors, respecting retry delay headers.
+
+    Args:
+        func: The async function to call.
+        max_retries (int): Maximum number of attempts before failing.
+
+    Returns:
+        Any: Result of the awaited function.
+    """
+    for attempt in range(max_retries):
+        try:
+            return await func(*args, **kwargs)
+        except ResourceExhausted as e:
+            if not is_retryable(e):
+                logger.error("❌ Non-retryable quota error: %s", e)
+                raise
+            if attempt >= max_retries - 1:
+                logger.error("❌ Max retries hit. Final failure: %s", e)
+                raise
+            wait_time = retry_wait_time(e, attempt)
+            logger.warning("⏳ Rate limit hit. Retrying in %.1f seconds (attempt %d)...", wait_time, attempt + 1)
+            await asyncio.sleep(wait_time)
+
+
+def retry_delay_wait(max_value: float = MAX_RETRY_WAIT):
+    """
+    `backoff` wait generator that prefers the server-suggested delay.
+
+    `backoff` sends the caught exception into the generator before each wait,
+    so every step can use that error's `retry_delay`, falling back to
+    exponential growth when none is given. Either way it is capped at `max_value`.
+
+    Args:
+        max_value (float): Upper bound for a single wait, in seconds.
+
+    Yields:
+        float: Seconds to wait before the next attempt (before jitter).
+    """
+    e = yield  # primed by backoff with an empty send
+    attempt = 0
+    while True:
+        e = yield min(parse_retry_delay(e) or (2 ** attempt), max_value)
+        attempt += 1
+
+
+def _on_backoff(details: dict) -> None:
+    # Hold every other caller of the throttled key back too: a decorated
+    # function passes its key's limiter as `limiter=`, the default key otherwise
+    limiter = details["kwargs"].get("limiter") or get_limiter(MODEL_NAME)
+    limiter.penalize(details["wait"])
+    logger.warning(
+        "⏳ Rate limit hit in %s. Retrying in %.1f seconds (attempt %d)...",
+        details["target"].__name__, details["wait"], details["tries"],
+    )
+
+
+# Decorator form of the same policy for functions retried via `backoff`; all
+# waiting happens here, so decorated functions must not sleep before re-raising.
+# A `limiter=` keyword argument of the decorated call is the one penalized on a 429.
+rate_limit_backoff = backoff.on_exception(
+    retry_delay_wait,
+    ResourceExhausted,
+    max_tries=MAX_TRIES,
+    max_time=MAX_RETRY_TIME,
+    jitter=_half_jitter,
+    giveup=lambda e: not is_retryable(e),
+    on_backoff=_on_backoff,
+)
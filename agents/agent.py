@@ -6,99 +6,37 @@ This module defines a multi-stage LangGraph pipeline that orchestrates:
 - ESG (Environmental, Social, Governance) analysis
 - Risk knowledge graph generation
 
-Each node includes rate-limiting resilience for Gemini API.
+Each node includes rate-limiting resilience for Gemini API, and the risk and ESG
+stages reuse on-disk results for the same company within a financial year.
 
 """
 
-from langgraph.graph import StateGraph, END  # type: ignore
-from typing import TypedDict, List, Annotated, Optional
+from langgraph.graph import StateGraph, START, END  # type: ignore
+from langgraph.types import Send  # type: ignore
+from typing import Any, AsyncIterator, TypedDict, List, Annotated, Tuple
 from agents.risk_reporter import fin_risk_agent
 from agents.esg_reporting import esg_risk_agent
 from agents.knowledge_graph import create_knowledge_graph_async
+from agents._cache import stage_cache_key, cache_get, cache_set, dedupe_inflight
+from agents._retry import async_retry
+from prompts_library.prompt import FINANCIAL_RISK_ASSESSMENT_PROMPT, ESG_REPORTING_PROMPT
+from tools.financial_year import get_current_financial_year
 import asyncio
 import json
 import logging
-import time
-import re
-from google.api_core.exceptions import ResourceExhausted
 
 # ---- Logging Setup ----
 logging.basicConfig(level=logging.INFO)
-
-
-# ---- Retry Delay Extractor ----
-def extract_retry_seconds_from_error(e: Exception) -> Optional[int]:
-    """
-    Extracts the retry delay in seconds from a Gemini API ResourceExhausted error.
-
-    Args:
-        e (Exception): The caught ResourceExhausted exception.
-
-    Returns:
-        Optional[int]: The parsed number of seconds to wait before retrying.
-    """
-    try:
-        match = re.search(r"retry_delay\s*{\s*seconds:\s*(\d+)", str(e))
-        if match:
-            return int(match.group(1))
-    except Exception as parse_err:
-        logging.warning(f"⚠️ Failed to parse retry delay: {parse_err}")
-    return None
-
-
-# ---- Retry Wrappers ----
-def retry_with_delay(func, *args, max_retries=6, **kwargs):
-    """
-    Synchronously retries a function on ResourceExhausted errors, respecting retry delay headers.
-
-    Args:
-        func: The function to call.
-        max_retries (int): Maximum number of retries before failing.
-
-    Returns:
-        Any: Result of the called function.
-    """
-    for attempt in range(max_retries):
-        try:
-            return func(*args, **kwargs)
-        except ResourceExhausted as e:
-            if attempt >= max_retries - 1:
-                logging.error(f"❌ Max retries hit. Final failure: {e}")
-                raise
-            retry_seconds = extract_retry_seconds_from_error(e)
-            wait_time = retry_seconds or (2 ** attempt) + (attempt * 0.5)
-            logging.warning(f"⏳ Rate limit hit. Retrying in {wait_time:.1f} seconds (attempt {attempt+1})...")
-            time.sleep(wait_time)
-
-
-async def async_retry_with_delay(func, *args, max_retries=6, **kwargs):
-    """
-    Asynchronously retries a coroutine on ResourceExhausted errors, respecting retry delay headers.
-
-    Args:
-        func: The async function to call.
-        max_retries (int): Maximum number of retries before failing.
-
-    Returns:
-        Any: Result of the awaited function.
-    """
-    for attempt in range(max_retries):
-        try:
-            return await func(*args, **kwargs)
-        except ResourceExhausted as e:
-            if attempt >= max_retries - 1:
-                logging.error(f"❌ Max retries hit. Final failure: {e}")
-                raise
-            retry_seconds = extract_retry_seconds_from_error(e)
-            wait_time = retry_seconds or (2 ** attempt) + (attempt * 0.5)
-            logging.warning(f"⏳ Rate limit hit. Retrying in {wait_time:.1f} seconds (attempt {attempt+1})...")
-            await asyncio.sleep(wait_time)
+logger = logging.getLogger(__name__)
 
 
 # ---- LangGraph State Definition ----
-class GraphState(TypedDict):
+class GraphState(TypedDict, total=False):
     """
     Represents the intermediate and final state of the LangGraph workflow.
+
+    Only `company_name` is supplied as input; the remaining keys are filled in
+    by the nodes that produce them.
     """
     company_name: Annotated[str, "Name of the company"]
     financial_risks: List[dict]
@@ -107,26 +45,27 @@ class GraphState(TypedDict):
 
 
 # ---- Workflow Nodes ----
-def start_node(state: GraphState) -> dict:
+def dispatch_agents(state: GraphState) -> List[Send]:
     """
-    Initial node: validates input and starts the graph.
+    Fans out to the independent risk and ESG agents so they run concurrently.
 
     Args:
-        state (GraphState): Initial state.
+        state (GraphState): Current workflow state.
 
     Returns:
-        dict: Empty output to continue graph.
+        List[Send]: One dispatch per independent agent node.
     """
-    company = state.get("company_name")
-    if not company or not isinstance(company, str):
-        raise ValueError("Missing or invalid 'company_name' in input.")
-    logging.info(f"🚀 Starting graph for: {company}")
-    return {}
+    return [
+        Send("run_risk_reporter", state),
+        Send("run_esg_reporting", state),
+    ]
 
 
-def run_risk_reporter(state: GraphState) -> dict:
+async def run_risk_reporter(state: GraphState) -> dict:
     """
-    Executes the financial risk agent with retry logic.
+    Asynchronously executes the financial risk agent with retry logic.
+
+    Risk batches run concurrently on the event loop, alongside the ESG branch.
 
     Args:
         state (GraphState): Current workflow state.
@@ -134,19 +73,30 @@ def run_risk_reporter(state: GraphState) -> dict:
     Returns:
         dict: Output containing financial_risks.
     """
-    logging.info("🔍 Running risk reporter (with rate limit protection)...")
+    cache_key = stage_cache_key("risk", state["company_name"], FINANCIAL_RISK_ASSESSMENT_PROMPT)
+    cached = cache_get("risk", cache_key)
+    if cached is not None:
+        logger.info("♻️ Using cached risk report with %d items.", len(cached))
+        return {"financial_risks": cached}
+
+    logger.info("🔍 Running risk reporter (with rate limit protection)...")
     try:
-        risks = retry_with_delay(fin_risk_agent, state["company_name"])
-        logging.info(f"✅ Risk reporter completed with {len(risks)} items.") # type: ignore
+        risks = await dedupe_inflight(
+            ("risk", state["company_name"], get_current_financial_year()),
+            async_retry, fin_risk_agent, state["company_name"],
+        )
+        logger.info("✅ Risk reporter completed with %d items.", len(risks))  # type: ignore
     except Exception as e:
-        logging.error(f"❌ Fatal error in risk reporter: {e}")
+        logger.error("❌ Fatal error in risk reporter: %s", e)
         raise
+    if risks:
+        cache_set("risk", cache_key, risks)
     return {"financial_risks": risks}
 
 
-def run_esg_reporting(state: GraphState) -> dict:
+async def run_esg_reporting(state: GraphState) -> dict:
     """
-    Executes the ESG reporting agent with retry logic.
+    Asynchronously executes the ESG reporting agent with retry logic.
 
     Args:
         state (GraphState): Current workflow state.
@@ -154,13 +104,21 @@ def run_esg_reporting(state: GraphState) -> dict:
     Returns:
         dict: Output containing esg_report.
     """
-    logging.info("🌱 Running ESG reporter (with rate limit protection)...")
+    cache_key = stage_cache_key("esg", state["company_name"], ESG_REPORTING_PROMPT)
+    cached = cache_get("esg", cache_key)
+    if cached is not None:
+        logger.info("♻️ Using cached ESG report with %d items.", len(cached))
+        return {"esg_report": cached}
+
+    logger.info("🌱 Running ESG reporter (with rate limit protection)...")
     try:
-        esg_data = retry_with_delay(esg_risk_agent, state["company_name"])
-        logging.info(f"✅ ESG reporting completed with {len(esg_data)} items.") # type: ignore
+        esg_data = await async_retry(esg_risk_agent, state["company_name"])
+        logger.info("✅ ESG reporting completed with %d items.", len(esg_data))  # type: ignore
     except Exception as e:
-        logging.error(f"❌ Fatal error in ESG reporter: {e}")
+        logger.error("❌ Fatal error in ESG reporter: %s", e)
         raise
+    if esg_data:
+        cache_set("esg", cache_key, esg_data)
     return {"esg_report": esg_data}
 
 
@@ -174,12 +132,12 @@ async def run_knowledge_graph(state: GraphState) -> dict:
     Returns:
         dict: Output containing risk_graph.
     """
-    logging.info("📊 Generating Knowledge Graph from risks (with rate limit protection)...")
+    logger.info("📊 Generating Knowledge Graph from risks (with rate limit protection)...")
     try:
-        kg_data = await async_retry_with_delay(create_knowledge_graph_async, state["financial_risks"])
-        logging.info("✅ Knowledge Graph generation complete.")
+        kg_data = await async_retry(create_knowledge_graph_async, state["financial_risks"])
+        logger.info("✅ Knowledge Graph generation complete.")
     except Exception as e:
-        logging.error(f"❌ Fatal error in Knowledge Graph: {e}")
+        logger.error("❌ Fatal error in Knowledge Graph: %s", e)
         raise
     return {"risk_graph": kg_data}
 
@@ -194,15 +152,15 @@ def compile_graph():
     """
     builder = StateGraph(GraphState)
 
-    builder.add_node("start", start_node)
     builder.add_node("run_risk_reporter", run_risk_reporter)
     builder.add_node("run_esg_reporting", run_esg_reporting)
     builder.add_node("run_knowledge_graph", run_knowledge_graph)
 
-    builder.set_entry_point("start")
-
-    builder.add_edge("start", "run_risk_reporter")
-    builder.add_edge("start", "run_esg_reporting")
+    builder.add_conditional_edges(
+        START,
+        dispatch_agents,
+        ["run_risk_reporter", "run_esg_reporting"],
+    )
     builder.add_edge("run_risk_reporter", "run_knowledge_graph")
     builder.add_edge("run_knowledge_graph", END)
     builder.add_edge("run_esg_reporting", END)
@@ -211,6 +169,31 @@ def compile_graph():
 
 
 # ---- Workflow Runner ----
+# Compiled once per process and shared by every run_agent call
+_GRAPH = None
+
+
+def _prepare_run(company_name: str) -> GraphState:
+    """
+    Validates the input, compiles the graph on first use and builds the input state.
+
+    Args:
+        company_name (str): Target company name.
+
+    Returns:
+        GraphState: Initial state for the graph.
+    """
+    if not company_name or not isinstance(company_name, str):
+        raise ValueError("Missing or invalid 'company_name' in input.")
+
+    global _GRAPH
+    if _GRAPH is None:
+        _GRAPH = compile_graph()
+
+    logger.info("🚀 Starting graph for: %s", company_name)
+    return {"company_name": company_name}
+
+
 async def run_agent(company_name: str):
     """
     Executes the complete workflow for a given company name.
@@ -221,17 +204,30 @@ async def run_agent(company_name: str):
     Returns:
         GraphState: Final state after execution.
     """
-    graph = compile_graph()
+    input_state = _prepare_run(company_name)
+    final_state = await _GRAPH.ainvoke(input_state)
+    return final_state
 
-    input_state: GraphState = {
-        "company_name": company_name,
-        "financial_risks": [],
-        "esg_report": [],
-        "risk_graph": {}
-    }
 
-    final_state = await graph.ainvoke(input_state)
-    return final_state
+async def run_agent_stream(company_name: str) -> AsyncIterator[Tuple[str, Any]]:
+    """
+    Executes the workflow and yields each result as soon as its stage finishes.
+
+    The ESG report usually arrives first, then the financial risks, then the
+    knowledge graph built from them.
+
+    Args:
+        company_name (str): Target company name.
+
+    Yields:
+        Tuple[str, Any]: A `GraphState` key ("financial_risks", "esg_report"
+            or "risk_graph") and its value.
+    """
+    input_state = _prepare_run(company_name)
+    async for update in _GRAPH.astream(input_state, stream_mode="updates"):
+        for node_output in update.values():
+            for key, value in (node_output or {}).items():
+                yield key, value
 
 
 # ---- CLI Entry Point ----
@@ -4,34 +4,31 @@ ESG Risk Agent
 This module analyzes ESG (Environmental, Social, Governance) risks for a given company
 using Google's Gemini 2.5 Flash model, a ReAct agent, and a grounded web search tool.
 
-Parallel execution is supported for different ESG categories with rate-limit retries
+All ESG categories are covered by a single batched agent call with rate-limit retries
 and citation-rich structured output.
 """
 
 
 import time
-import re
+import asyncio
 import logging
-from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import List, Literal
 
 from tools.financial_year import get_current_financial_year
 from tools.google_search import grounded_search_tool
 from prompts_library.prompt import ESG_REPORTING_PROMPT, ESG_CATEGORIES
+from agents._retry import rate_limit_backoff
+from agents._cache import dedupe_inflight
+from agents._pool import AgentPool
+from agents._rate_limit import AsyncLimiter
 
-from langchain_google_genai import ChatGoogleGenerativeAI  # type: ignore
 from langgraph.prebuilt import create_react_agent  # type: ignore
-from pydantic import BaseModel
-import backoff  # type: ignore
-from google.api_core.exceptions import ResourceExhausted
+from pydantic import BaseModel, TypeAdapter
 
 
 # ---- Logging Setup ----
 logging.basicConfig(level=logging.INFO)
-
-
-# ---- Initialize Gemini LLM ----
-llm = ChatGoogleGenerativeAI(model="gemini-2.5-flash")
+logger = logging.getLogger(__name__)
 
 
 # ---- Output Schemas ----
@@ -47,126 +44,131 @@ class ESGReport(BaseModel):
     """
     Structured ESG insight for a specific category.
     """
-    esg_category: Literal["Environment", "Social", "Governance"]
+    esg_category: Literal["Environmental", "Social", "Governance"]
     description: str
     citations: List[Citation]
 
 
+class ESGReportBundle(BaseModel):
+    """
+    All ESG insights for a company, one report per category.
+    """
+    reports: List[ESGReport]
+
+
+# Dumps a whole list of reports in one pass instead of per-model model_dump()
+_REPORTS_ADAPTER = TypeAdapter(List[ESGReport])
+
+
 # ---- ReAct Agent Setup ----
-agent = create_react_agent(
-    model=llm,
+# One agent per configured API key, compiled on first use
+AGENT_POOL = AgentPool(lambda model: create_react_agent(
+    model=model,
     tools=[grounded_search_tool],
-    response_format=ESGReport
-)
+    response_format=ESGReportBundle
+))
 
 
 # ---- Retry Logic ----
-def extract_retry_seconds_from_error(e: Exception) -> int:
+@rate_limit_backoff
+async def invoke_with_retry(agent, prompt: str, *, limiter: AsyncLimiter) -> dict:
     """
-    Parses the retry delay (in seconds) from a ResourceExhausted exception.
+    Invokes one pool member's agent, retrying on rate limit errors.
 
     Args:
-        e (Exception): The exception raised by Gemini API.
+        agent: The member's compiled agent.
+        prompt (str): Formatted ESG prompt.
+        limiter (AsyncLimiter): The member's rate limiter, penalized on a 429.
 
     Returns:
-        int: Seconds to wait before retrying.
+        dict: The agent's final state.
     """
-    match = re.search(r"retry_delay\s*{\s*seconds:\s*(\d+)", str(e))
-    if match:
-        return int(match.group(1))
-    return 15  # default fallback delay
+    return await agent.ainvoke({"messages": [{"role": "user", "content": prompt}]})
 
 
-@backoff.on_exception(
-    backoff.expo,
-    ResourceExhausted,
-    max_tries=6,
-    jitter=backoff.full_jitter,
-)
-def process_category_with_retry(category: str, company_name: str) -> dict:
+async def process_categories_with_retry(categories: List[str], company_name: str) -> dict:
     """
-    Invokes the Gemini agent for a single ESG category with retry logic.
+    Asynchronously invokes the Gemini agent once for all ESG categories with retry logic.
+
+    Retries stay on the pool member that was picked, so a 429 slows down
+    that member's key rather than the default one.
 
     Args:
-        category (str): ESG category ("Environment", "Social", "Governance").
+        categories (List[str]): ESG categories ("Environmental", "Social", "Governance").
         company_name (str): Name of the target company.
 
     Returns:
-        dict: Structured response, category, and execution time.
+        dict: Structured responses, categories, and execution time.
     """
-    time.sleep(7)  # avoid aggressive API calls
-
     prompt = ESG_REPORTING_PROMPT.format(
-        esg_category=category,
+        esg_categories=categories,
         company_name=company_name,
         financial_year=get_current_financial_year()
     )
 
     start = time.time()
-    try:
-        response = agent.invoke({"messages": [{"role": "user", "content": prompt}]})
-        end = time.time()
-        return {
-            "category": category,
-            "output": response["structured_response"].model_dump(),
-            "time": end - start
-        }
-    except ResourceExhausted as e:
-        retry_secs = extract_retry_seconds_from_error(e)
-        logging.warning(f"⏳ Rate limit hit for {category}. Retrying after {retry_secs}s...")
-        time.sleep(retry_secs)
-        raise e
-    except Exception as e:
-        raise e  # Let non-retriable errors bubble up
+    async with AGENT_POOL.acquire() as member:
+        response = await invoke_with_retry(member.agent, prompt, limiter=member.limiter)
+    end = time.time()
+    return {
+        "categories": categories,
+        "output": _REPORTS_ADAPTER.dump_python(response["structured_response"].reports),
+        "time": end - start
+    }
 
 
-def process_category(category: str, company_name: str) -> dict:
+async def process_categories(categories: List[str], company_name: str) -> dict:
     """
     Wrapper around category processing to catch and report errors.
 
     Args:
-        category (str): ESG category.
+        categories (List[str]): ESG categories.
         company_name (str): Company to analyze.
 
     Returns:
         dict: Either a success dict with output, or error message.
     """
     try:
-        return process_category_with_retry(category, company_name)
+        return await process_categories_with_retry(categories, company_name)
     except Exception as e:
-        return {"category": category, "error": str(e)}
+        return {"categories": categories, "error": str(e)}
 
 
 # ---- Main Agent Function ----
-def esg_risk_agent(company_name: str) -> List[dict]:
+async def esg_risk_agent(company_name: str) -> List[dict]:
     """
-    Processes all ESG categories for a given company using parallel threads.
+    Processes all ESG categories for a given company in a single agent call.
 
     Args:
         company_name (str): Company to assess.
 
     Returns:
-        List[dict]: List of ESGReport dicts (if successful) or error entries.
+        List[dict]: List of ESGReport dicts (empty if the call failed).
     """
-    results, structured_response = [], []
+    result = await dedupe_inflight(
+        ("esg", company_name, get_current_financial_year()),
+        process_categories, ESG_CATEGORIES, company_name,
+    )
+
+    if "error" in result:
+        logger.error("❌ %s failed: %s", result["categories"], result["error"])
+        return []
+
+    logger.info("✅ %s took %.2f seconds", result["categories"], result["time"])
+    return result["output"]
 
-    with ThreadPoolExecutor(max_workers=1) as executor:
-        futures = [
-            executor.submit(process_category, cat, company_name)
-            for cat in ESG_CATEGORIES
-        ]
 
-        for future in as_completed(futures):
-            result = future.result()
-            results.append(result)
+def esg_risk_agent_sync(company_name: str) -> List[dict]:
+    """
+    Blocking shim around `esg_risk_agent` for callers without an event loop.
 
-            if "error" in result:
-                print(f"\n❌ {result['category']} failed: {result['error']}")
-            else:
-                print(f"\n✅ {result['category']} took {result['time']:.2f} seconds")
-                structured_response.append(result["output"])
+    Args:
+        company_name (str): Company to assess.
 
-    return structured_response
+    Returns:
+        List[dict]: List of ESGReport dicts (empty if the call failed).
+    """
+    return asyncio.run(esg_risk_agent(company_name))
 
 
 # ---- CLI Entrypoint ----
@@ -174,6 +176,6 @@ if __name__ == "__main__":
     import json
     company = input("Enter company name : ")
     print(f"🔍 Running ESG risk assessment for: {company}")
-    agent_response = esg_risk_agent(company)
+    agent_response = esg_risk_agent_sync(company)
     print("\n📊 Final ESG Report:\n")
     print(json.dumps(agent_response, indent=4))
@@ -1,131 +1,41 @@
-input_data = [
-    {
-        "risk_title": "Low Credit Risk for MRF Tyres due to Strong Credit Ratings",
-        "description": "MRF Tyres demonstrates a robust credit profile, indicative of a low inherent credit risk. This is consistently affirmed by leading Indian credit rating agencies. CARE Ratings, as of September 30, 2024, relevant for the Financial Year FY2025, reaffirmed MRF Limited's long-term bank facilities (Fund Based) worth \u20b91200 crore at 'CARE AAA' with a Stable Outlook and its short-term bank facilities (Non-Fund Based) worth \u20b9550 crore at 'CARE A1+'. Similarly, ICRA reaffirmed MRF Limited's long-term rating at [ICRA]AAA (Stable) on November 30, 2021. These top-tier ratings are underpinned by MRF's formidable business risk profile, which includes a dominant market share in the Indian tyre industry, strong brand equity, an extensive distribution network, and a diversified product portfolio. Furthermore, the company maintains a healthy financial risk profile, characterized by a substantial net worth, stable earnings, robust liquidity, and comfortable debt protection metrics. The positive outlook for the Indian tyre industry, as projected by CRISIL Ratings for the current fiscal year (as of July 18, 2025) with an anticipated 7-8% revenue growth driven by strong replacement demand, further reinforces MRF's creditworthiness. CRISIL expects the industry's credit profile to remain solid due to strong cash accruals and prudent capital management, directly benefiting major players like MRF by mitigating sector-specific credit vulnerabilities.",
-        "risk_category": [
-            "Credit Risk"
-        ],
-        "severity": "Low",
-        "mitigation": "MRF Tyres effectively mitigates credit risk through a combination of stringent financial management and robust operational strategies. The company's approach includes maintaining a healthy financial risk profile, which is evident in its substantial net worth, consistent stable earnings, and a strong liquidity position, ensuring ample cash flows to meet all debt obligations. Prudent capital management practices contribute to comfortable debt protection metrics, a factor consistently highlighted by rating agencies. Operationally, MRF's market leadership, strong brand image, and extensive distribution network across the Indian tyre market provide significant stability to its revenue streams, thereby reducing dependence on any single segment or customer. A diversified product portfolio further insulates the company from demand fluctuations in specific tyre categories, ensuring revenue predictability. Adherence to these practices aligns with Indian industry best practices for maintaining a strong credit profile, where companies prioritize efficient working capital management, disciplined capital expenditure, and fostering strong relationships with financial institutions to secure credit on favorable terms.",
-        "impact": "The low credit risk profile of MRF Tyres significantly impacts its financial, operational, and reputational standing within the Indian market, primarily in a positive manner. Financially, the 'AAA' and 'A1+' credit ratings translate into easier and more cost-effective access to capital, enabling the company to secure loans and other financing at preferential interest rates. This directly reduces the cost of debt, thereby enhancing overall profitability and providing greater flexibility to fund growth initiatives, capacity expansions, or strategic investments. Operationally, strong creditworthiness ensures uninterrupted access to supplier credit and favorable terms with vendors, which streamlines the supply chain and supports efficient working capital management. It also provides a crucial buffer against unexpected economic downturns or market volatility, allowing the company to maintain operational stability. Reputational benefits include enhanced confidence among investors, lenders, customers, and other stakeholders, reinforcing MRF's image as a financially sound and reliable entity. This heightened trust can positively influence stock performance, attract long-term investors, and strengthen business relationships, ultimately contributing to a sustained competitive advantage in the dynamic Indian market.",
-        "citations": [
-            {
-                "title": "MRF Limited - careratings.com",
-                "url": "https://www.careratings.com/upload/CompanyFiles/PR/202409120943_MRF_Limited.pdf"
-            },
-            {
-                "title": "MRF Limited - careratings.com",
-                "url": "https://www.careratings.com/upload/CompanyFiles/PR/202310131023_MRF_Limited.pdf"
-            },
-            {
-                "title": "MRF Limited - scribd.com",
-                "url": "https://www.scribd.com/document/729927101/MRF-Limited-r-30112020"
-            },
-            {
-                "title": "Tyre Stocks In Focus: CEAT, MRF, Apollo, JK Tyre Set To Roll As CRISIL Projects 7-8% Revenue Growth - Details - republicworld.com",
-                "url": "https://www.republicworld.com/business/tyre-stocks-in-focus-ceat-mrf-apollo-jk-tyre-set-to-roll-as-crisil-projects-78-revenue-growth-details"
-            }
-        ]
-    },
-    {
-        "risk_title": "Raw Material Price Volatility and Profitability Pressures",
-        "description": "MRF Tyres experienced significant operational challenges in Fiscal Year 2025 (FY2025), primarily characterized by the volatility of raw material prices and their subsequent impact on profitability. Despite a 12.1% increase in total revenue to Rs 285,613 million, the company's net profit declined by 10.2% to Rs 18,693 million compared to FY2024. A key contributor to this financial pressure was an unprecedented surge in raw material costs, particularly natural rubber, which reportedly doubled within a four-month period during Q2 FY2025 (July to September 2024). This sharp increase in input costs directly manifested as a 20.3% dip in standalone profit after tax for that quarter, even though revenue grew by 11%. Furthermore, operating profit margins for FY2025 decreased to 14.5% from 16.9% in FY2024. While MRF attempted to mitigate these rising costs through product price increases, the sustained pressure on profitability highlights the critical relevance of managing raw material cost fluctuations as a core operational risk. The company's continued focus on improving operational efficiencies, as implied by its contribution to previous year's profit growth, underscores its ongoing importance in their operational strategy.",
-        "risk_category": [
-            "Operational Risk"
-        ],
-        "severity": "Medium",
-        "mitigation": "MRF Tyres has implemented several strategies to mitigate operational risks. In response to the substantial increase in raw material prices during FY2025, the company partially offset these rising input costs by instituting price increases for its final products. Although specific new operational controls for FY2025 are not detailed, the company's consistent emphasis on enhancing operational efficiencies, which contributed to profit growth in FY2024, indicates an ongoing commitment to optimizing internal processes and cost structures. From an industrial relations perspective, MRF has maintained harmonious and cordial relations across all its manufacturing units, as reported for the financial year ended March 31, 2024. This stable labor environment is a crucial element in mitigating operational disruptions. Furthermore, MRF demonstrates a forward-looking approach to risk management through its long-term commitment to sustainability and decarbonization. The company has set phase-wise targets and commitments to improve its environmental performance and contribute to India's Net Zero emission target by 2070, signifying a strategic focus on mitigating environmental operational risks and aligning with national sustainability goals.",
-        "impact": "The operational challenges faced by MRF Tyres in FY2025 had a discernible financial impact. The net profit declined by 10.2% to Rs 18,693 million, and operating profit margins decreased from 16.9% to 14.5%. A particularly acute financial impact was observed in Q2 FY2025, where standalone profit after tax fell by 20.3% due to escalating raw material costs. Operationally, the company was compelled to manage significant volatility in input costs, specifically the doubling of natural rubber prices, which directly influenced production expenses and necessitated adjustments to product pricing. This highlights the ongoing challenge of maintaining operational stability amidst external cost pressures. While no negative reputational impact was explicitly stated, MRF's proactive initiatives in sustainability and decarbonization, aimed at supporting India's Net Zero emission target, could positively enhance its corporate reputation within the Indian business landscape. The reported harmonious industrial relations also contribute positively to its operational and reputational standing, ensuring labor stability.",
-        "citations": [
-            {
-                "title": "mrftyres.com",
-                "url": "https://www.mrftyres.com/downloads/investor-relations-results-07-05-2025.pdf"
-            },
-            {
-                "title": "equitymaster.com",
-                "url": "https://www.equitymaster.com/research-it/annual-results-analysis/MRF/MRF-2024-25-Annual-Report-Analysis/12458"
-            },
-            {
-                "title": "indiatimes.com",
-                "url": "https://timesofindia.indiatimes.com/business/india-business/mrf-posts-20-fall-in-profit-after-tax/articleshow/115087656.cms"
-            },
-            {
-                "title": "mrftyres.com",
-                "url": "https://www.mrftyres.com/downloads/MRF-Annual-Report-2024-Final.pdf"
-            }
-        ]
-    },
-    {
-        "risk_title": "Strategic Risks in a Competitive and Evolving Tyre Industry",
-        "description": "MRF Tyres faces several strategic risks within the highly competitive and evolving Indian tyre industry. The primary strategic risk is the intense competition from other established domestic tyre manufacturers. This competitive landscape, coupled with significant industry-wide investments in capacity expansion, including by MRF itself, has reportedly impacted the company's Return on Capital Employed (RoCE). Another significant strategic risk stems from the inherent cyclicality of the tyre industry, which can lead to fluctuations in MRF's revenues. Furthermore, the volatility of raw material prices, particularly natural rubber and crude oil-linked derivatives, poses a continuous strategic challenge as it directly impacts production costs and necessitates price adjustments, affecting profitability. The emerging trend of Electric Vehicles (EVs) introduces a new strategic risk, as the full impact of this shift on the tyre industry is still being assessed, potentially requiring significant adaptation in product development and market strategy. Finally, Environmental, Social, and Governance (ESG) concerns represent a growing strategic risk. The tyre manufacturing process has environmental implications (emissions, waste, water consumption) and social impacts, requiring MRF to invest in sustainable practices, technology absorption, and innovation to meet evolving regulatory and societal expectations and contribute to India's Net Zero emission goals by 2070.",
-        "risk_category": [
-            "Strategic Risk",
-            "Operational Risk"
-        ],
-        "severity": "Medium",
-        "mitigation": "MRF Tyres has established a robust risk management framework to mitigate its strategic risks. A dedicated Risk Management Committee of the Board is responsible for reviewing risk management initiatives on a half-yearly basis. This includes frameworks for risk identification, the implementation of mitigation measures, and the development of business continuity plans. To address the intense competition and maintain market position, MRF leverages its strong brand image, long operational track record, market leadership, and extensive distribution network, particularly in the replacement market. The company's strong financial risk profile, characterized by low overall gearing, comfortable debt coverage metrics, and robust liquidity, provides a buffer against industry cyclicality and raw material price volatility. In response to raw material price fluctuations, the company has historically adjusted product prices and benefits from the stabilization of prices. For ESG risks, MRF is actively focused on mitigating environmental and social impacts by setting phase-wise targets for improving sustainability performance and contributing to India's Net Zero emission goals by 2070. This includes efforts towards technology absorption, adaptation, and innovation, such as joint R&D with universities to develop sustainable materials (bio-derived and circular) and advance green tyre technologies. The company is continuously assessing the impact of Electric Vehicles (EVs) to adapt its strategic direction accordingly.",
-        "impact": "The strategic risks faced by MRF Tyres can have significant impacts across various facets of the company in the Indian context. Intense competition and industry-wide capacity expansion can lead to pressure on profit margins and a potential decrease in Return on Capital Employed (RoCE), as noted in recent reports. While MRF has maintained its market position, sustained competitive pressure could necessitate further investments in marketing and R&D, impacting financial performance. The cyclicality of the tyre industry can lead to revenue volatility, making financial planning and forecasting more challenging. Fluctuations in raw material prices directly impact the cost of goods sold, which, if not effectively managed through price adjustments or efficiency gains, can erode profitability. Operationally, this necessitates constant monitoring of global commodity markets. The emergence of Electric Vehicles (EVs) presents an evolving impact; while the full extent is uncertain, it could necessitate significant capital expenditure in R&D for new tyre technologies suitable for EVs, potentially altering market demand for traditional tyres. Reputational and financial impacts from ESG risks are also significant. Non-compliance with environmental regulations or failure to meet sustainability targets could lead to regulatory fines, increased operational costs for environmental controls, and damage to brand image among environmentally conscious consumers and investors. Conversely, proactive ESG measures can enhance reputation and attract sustainable investments, aligning with India's growing focus on green initiatives.",
-        "citations": [
-            {
-                "title": "MRF-Annual-Report-2024-Final.pdf",
-                "url": "https://www.mrftyres.com/downloads/MRF-Annual-Report-2024-Final.pdf"
-            },
-            {
-                "title": "MRF_Limited.pdf",
-                "url": "https://www.careratings.com/upload/CompanyFiles/PR/202409120943_MRF_Limited.pdf"
-            },
-            {
-                "title": "Annual_Report_2022-23.pdf",
-                "url": "https://www.mrftyres.com/downloads/Annual_Report_2022-23.pdf"
-            },
-            {
-                "title": "MRF-2023-24-Annual-Report-Analysis",
-                "url": "https://www.equitymaster.com/research-it/annual-results-analysis/MRF/MRF-2023-24-Annual-Report-Analysis/10482"
-            }
-        ]
-    },
-    {
-        "risk_title": "Antitrust Penalty and Regulatory Compliance Challenges",
-        "description": "The primary compliance risk for MRF Tyres in India is centered around a substantial antitrust penalty imposed by the Competition Commission of India (CCI). The CCI levied a fine of \u20b9622.09 crore on MRF Ltd. (as part of a larger \u20b91788 crore fine across multiple tyre manufacturers) for engaging in anti-competitive practices. This included cartelization, where the company, along with other tyre manufacturers, was found to have exchanged price-sensitive information and collectively decided on tyre prices, violating competition laws. The genesis of this risk lies in alleged collusive behavior aimed at manipulating market dynamics.\n\nThis risk manifests as ongoing, high-stakes legal challenges and significant financial exposure. Although the Supreme Court initially dismissed appeals against the CCI's original order in January 2022, a subsequent and critical development occurred when the National Company Law Appellate Tribunal (NCLAT) directed the CCI to reconsider and recalculate the fine. The NCLAT cited \"arithmetical and inadvertent errors\" in the original calculation and emphasized the need to protect the domestic tyre industry. MRF has since appealed this NCLAT order to the Supreme Court, which, as recently as September 2023, sought a response from the CCI, underscoring the active and unresolved nature of this legal battle. This continuous litigation poses a significant operational and financial drain.\n\nBeyond the immediate antitrust concerns, the company also navigates broader regulatory compliance. A Madras High Court judgment in April 2024, involving MRF Ltd. and the CCI, established an important precedent regarding procedural fairness in CCI investigations. The court ruled that entities must be properly notified and given an opportunity to contest their designation as an \"opposite party,\" especially if their status changes from a \"third party\" to a \"contesting party,\" requiring a \"speaking order\" from the CCI. This ruling could influence future CCI investigations and potentially impact ongoing or future antitrust matters. Furthermore, MRF addresses consumer law compliance, having successfully appealed some consumer complaints (e.g., a February 2024 case and a May 2023 case) where manufacturing defects were not substantiated, demonstrating a robust defense mechanism. Environmental compliance is also a focus, with MRF acknowledging ongoing litigation before the National Green Tribunal (NGT) in Chennai concerning alleged lack of approvals for new constructions. However, a committee appointed by the NGT concluded that necessary approvals were in place, and the matter awaits final disposal, indicating proactive engagement with environmental regulations.",
-        "risk_category": [
-            "Compliance Risk"
-        ],
-        "severity": "High",
-        "mitigation": "MRF Tyres is actively employing a robust legal defense strategy to mitigate the significant \u20b9622.09 crore antitrust penalty imposed by the Competition Commission of India (CCI). The company has escalated the matter to the highest court, filing an appeal in the Supreme Court challenging the National Company Law Appellate Tribunal (NCLAT)'s directive for the CCI to recalculate the fine. This ongoing appeal, for which the Supreme Court sought a response from the CCI in September 2023, is a primary mitigation strategy aimed at reducing or overturning the substantial financial liability. This demonstrates a commitment to exhaust all legal avenues to protect shareholder value.\n\nTo mitigate risks arising from consumer law compliance, MRF has established effective processes for managing consumer complaints and subsequent litigation. For instance, in a February 2024 case, a District Consumer Disputes Redressal Commission initially ordered MRF to replace tyres and pay compensation. However, MRF successfully appealed this decision, resulting in the case's dismissal due to the lack of evidence of manufacturing defects. Similarly, a May 2023 consumer complaint against MRF concerning a defective tyre was also set aside on appeal. These instances highlight the company's ability to defend its position when manufacturing defects are not substantiated, thereby limiting financial and reputational exposure from consumer disputes.\n\nMRF demonstrates proactive mitigation in environmental compliance by actively engaging with regulatory bodies and addressing litigation. The company's Business Responsibility and Sustainability Report for FY 2022-23 acknowledged an ongoing litigation before the National Green Tribunal (NGT) in Chennai concerning alleged lack of approvals for new constructions. Significantly, a committee appointed by the NGT concluded that the necessary approvals were in place, and the matter is awaiting final disposal, indicating a positive development in resolving this environmental compliance challenge. Furthermore, MRF actively seeks environmental clearances for its projects, such as for land leveling for a new manufacturing facility, and emphasizes its commitment to sustainability and compliance with waste tyre regulations, showcasing a preventative approach to environmental risks.",
-        "impact": "The most immediate and substantial impact of the compliance risk is the potential financial burden arising from the \u20b9622.09 crore penalty imposed by the Competition Commission of India (CCI) for cartelization. While the National Company Law Appellate Tribunal (NCLAT) has directed a recalculation, and MRF has an ongoing appeal in the Supreme Court, this amount represents a material contingent liability. If upheld, even partially, it could significantly impact the company's profitability, cash reserves, and overall financial health. The ongoing legal expenses incurred in defending these high-profile cases further contribute to financial strain, diverting resources that could otherwise be allocated to growth or operational improvements.\n\nAllegations of cartelization and anti-competitive practices carry a severe reputational risk for MRF Tyres in the Indian market. Such findings can erode public trust, potentially leading to a decline in brand loyalty among consumers and a negative perception among investors and business partners. The continuous media attention surrounding the ongoing legal battles further exacerbates this reputational damage. While the direct impact on sales or market share is not explicitly detailed, a damaged reputation can indirectly affect future business opportunities, brand value, and investor confidence in the long term.\n\nThe ongoing antitrust litigation and the Madras High Court judgment regarding Competition Commission of India (CCI) investigation procedures suggest a heightened level of regulatory scrutiny for MRF. This increased oversight can lead to a greater operational burden, as the company may need to dedicate substantial management time, legal resources, and internal compliance efforts to address inquiries, prepare for hearings, and ensure strict adherence to evolving regulatory frameworks. This diversion of resources from core business operations and strategic initiatives can impact operational efficiency and growth prospects. Furthermore, the company may face more stringent compliance requirements and audits in the future, potentially increasing operational costs and complexity in maintaining regulatory adherence.",
-        "citations": [
-            {
-                "title": "Fine on tyre companies: Supreme Court seeks CCI's reply on MRF plea",
-                "url": "https://economictimes.indiatimes.com/industry/auto/tyres/fine-on-tyre-companies-supreme-court-seeks-ccis-reply-on-mrf-plea/articleshow/103941621.cms?from=mdr"
-            },
-            {
-                "title": "The story of a Rs 1,788 crore fine: Tyre makers' cartelisation and calculation errors",
-                "url": "https://economictimes.indiatimes.com/industry/auto/tyres/the-story-of-a-rs-1788-crore-fine-tyre-makers-cartelisation-and-calculation-errors/articleshow/104011105.cms?from=mdr"
-            },
-            {
-                "title": "Competition Comm says SC dismissed tyre companies' appeals against its order",
-                "url": "https://timesofindia.indiatimes.com/competition-comm-says-sc-dismissed-tyre-companies-appeals-against-its-order/articleshow/89304370.cms"
-            },
-            {
-                "title": "Madras High Court: Entity Entitled To Know Status In Proceeding; CCI Order Opaque",
-                "url": "https://www.livelaw.in/high-court/madras-high-court/madras-high-court-entity-entitled-to-know-status-in-proceeding-cci-order-opaque-260147"
-            },
-            {
-                "title": "MRF Tyres Business Responsibility and Sustainability Report for FY ended 31st March 24",
-                "url": "https://www.mrftyres.com/downloads/Business-Responsibility-Sustainability-Report-for-FY-ended-31st-March-24.pdf"
-            },
-            {
-                "title": "ECLSEIAA_192451_T56395_SIA_GA_MIN_235032_2021.pdf",
-                "url": "https://www.mrftyres.com/downloads/ECLSEIAA_192451_T56395_SIA_GA_MIN_235032_2021.pdf"
-            },
-            {
-                "title": "Consumer complaint against MRF dismissed by State Commission",
-                "url": "https://www.taxtmi.com/news?id=25050"
-            }
-        ]
-    }
-]
+"""
+Sample knowledge graph input: financial risk assessments for MRF Tyres.
+
+The data lives in the sibling `kg_input.json` and is parsed on first use rather
+than at import time, so importing this module is cheap.
+
+Citations are stored column-wise as `{"titles": [...], "urls": [...]}` rather
+than as a list of `{"title", "url"}` dicts; zip the two lists to pair them up.
+"""
+
+from functools import lru_cache
+from pathlib import Path
+from typing import List
+
+try:
+    import orjson  # type: ignore
+except ImportError:  # optional speed-up; fall back to the stdlib parser
+    orjson = None
+
+_PATH = Path(__file__).with_suffix(".json")
+
+
+@lru_cache(maxsize=1)
+def load_input_data() -> List[dict]:
+    """
+    Loads the sample risk assessments, parsing the JSON file once per process.
+
+    Returns:
+        List[dict]: Risk assessment records in the `fin_risk_agent` output shape,
+            except for the column-wise `citations`.
+    """
+    raw = _PATH.read_bytes()
+    if orjson is not None:
+        return orjson.loads(raw)
+    import json
+    return json.loads(raw)
+
 
 if __name__ == "__main__":
     import json
-    print(json.dumps(input_data, indent=4))
\ No newline at end of file
+    print(json.dumps(load_input_data(), indent=4))
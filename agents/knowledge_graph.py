@@ -7,42 +7,68 @@ This module is used to transform natural language risk descriptions into a
 structured graph (nodes and edges) for visualization and semantic understanding.
 
 Dependencies:
-- Google Generative AI SDK (Gemini 2.5)
+- Google Generative AI SDK (Gemini 2.5, shared via agents._llm)
 - LangChain
 - Pydantic
+- NumPy (columnar graph export)
 - Backoff for retry handling
 """
 
-from dotenv import load_dotenv
-load_dotenv()
-
 import time
 import asyncio
-import re
+import functools
+import hashlib
+import json
 import logging
-import backoff  # type: ignore
-from typing import List
-from langchain_google_genai import ChatGoogleGenerativeAI  # type: ignore
-from pydantic import BaseModel, Field
+import sys
+from typing import Any, AsyncIterator, Dict, List, Optional
+import numpy as np
+from langchain_core.runnables import Runnable  # type: ignore
+from pydantic import BaseModel, ConfigDict, TypeAdapter
 from prompts_library.prompt import RISK_PARSER_PROMPT
+from agents._llm import get_gemini_flash
+from agents._retry import rate_limit_backoff
+from agents._cache import cache_get, cache_set
 from google.api_core.exceptions import ResourceExhausted
 
+try:
+    import orjson  # type: ignore
+except ImportError:  # optional speed-up; fall back to the stdlib encoder
+    orjson = None
+
 # Set up logging
 logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def _strip_description(schema: dict) -> None:
+    schema.pop("description", None)
+
+
+# Shared config for the LLM-facing graph models: ignore extra fields Gemini
+# may add and keep the class docstrings out of the generated JSON schema
+_SCHEMA_CONFIG = ConfigDict(extra="ignore", json_schema_extra=_strip_description)
 
 
 class RiskAssessmentNode(BaseModel):
     """
     Represents a single node in the risk knowledge graph.
 
+    The graph models carry no `Field` descriptions on purpose, and their
+    docstrings are kept out of the JSON schema (see `_SCHEMA_CONFIG`): the
+    schema is sent to Gemini on every call and the field names are already
+    self-describing.
+
     Attributes:
         id (int): Unique identifier for the node.
         name (str): Title of the risk factor.
         description (str): Description of the node and its dependencies.
     """
-    id: int = Field(..., description="Unique identifier for the risk node")
-    name: str = Field(..., description="Short name/title of the risk")
-    description: str = Field(..., description="Explanation of logical connections")
+    model_config = _SCHEMA_CONFIG
+
+    id: int
+    name: str
+    description: str
 
 
 class RiskLink(BaseModel):
@@ -53,8 +79,10 @@ class RiskLink(BaseModel):
         source (int): ID of the source node.
         target (int): ID of the target node.
     """
-    source: int = Field(..., description="ID of the source node in the relationship")
-    target: int = Field(..., description="ID of the target node in the relationship")
+    model_config = _SCHEMA_CONFIG
+
+    source: int
+    target: int
 
 
 class RiskOutput(BaseModel):
@@ -65,41 +93,104 @@ class RiskOutput(BaseModel):
         nodes (List[RiskAssessmentNode]): All nodes in the graph.
         links (List[RiskLink]): Directed edges connecting the nodes.
     """
+    model_config = _SCHEMA_CONFIG
+
     nodes: List[RiskAssessmentNode]
     links: List[RiskLink]
 
-
-def extract_retry_seconds_from_error(e: Exception) -> int:
+    def to_soa(self) -> Dict[str, Any]:
+        """
+        Returns the graph as columns (structure of arrays) instead of objects.
+
+        Node and edge IDs become contiguous int32 arrays, which is what
+        vectorized graph operations (degree counts, adjacency via
+        `np.bincount` or a sparse matrix) and the visualization layer want.
+
+        Returns:
+            Dict[str, Any]: `node_ids`, `node_names`, `node_descriptions`,
+                `edge_src` and `edge_tgt`, with index i of each node column
+                describing the same node.
+        """
+        return {
+            "node_ids": np.fromiter((n.id for n in self.nodes), dtype=np.int32, count=len(self.nodes)),
+            "node_names": [n.name for n in self.nodes],
+            "node_descriptions": [n.description for n in self.nodes],
+            "edge_src": np.fromiter((l.source for l in self.links), dtype=np.int32, count=len(self.links)),
+            "edge_tgt": np.fromiter((l.target for l in self.links), dtype=np.int32, count=len(self.links)),
+        }
+
+
+def _dumps_compact(obj) -> str:
     """
-    Extracts retry delay (in seconds) from a Gemini rate limit error message.
+    Serializes `obj` to compact JSON for embedding in a prompt.
+
+    Compact JSON (no padding spaces, real double quotes) costs fewer input
+    tokens than Python's repr and is easier for Gemini to parse.
 
     Args:
-        e (Exception): The raised exception.
+        obj: JSON-serializable value.
 
     Returns:
-        int: Number of seconds to wait before retrying. Defaults to 15 if unspecified.
+        str: Compact JSON text.
     """
-    match = re.search(r"retry_delay\\s*{\\s*seconds:\\s*(\\d+)", str(e))
-    if match:
-        return int(match.group(1))
-    return 15
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode()
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False)
+
+
+# Batch validators for merged shard output
+_NODES_ADAPTER = TypeAdapter(List[RiskAssessmentNode])
+_LINKS_ADAPTER = TypeAdapter(List[RiskLink])
 
+# Maximum number of risks sent to Gemini in a single graph request
+KG_SHARD_SIZE = 6
 
-@backoff.on_exception(
-    backoff.expo,
-    ResourceExhausted,
-    max_tries=6,
-    jitter=backoff.full_jitter,
-)
-async def invoke_llm(prompt: str, llm: ChatGoogleGenerativeAI) -> RiskOutput:
+@functools.lru_cache(maxsize=1)
+def _get_agent() -> Runnable:
+    """
+    Returns the structured-output Gemini runnable, built once per process.
+
+    Binding the `RiskOutput` schema compiles it to a tool/JSON schema, so the
+    result is cached instead of being rebuilt for every graph request.
+
+    Returns:
+        Runnable: Gemini model bound to the `RiskOutput` schema.
+    """
+    return get_gemini_flash().with_structured_output(RiskOutput)
+
+
+async def stream_llm(prompt: str, structured_agent: Runnable) -> AsyncIterator[RiskOutput]:
+    """
+    Streams structured output from Gemini as it is generated.
+
+    Each yielded value is the most complete `RiskOutput` parsed so far; the last
+    one is the final graph. No retries are applied here.
+
+    Args:
+        prompt (str): The formatted prompt string for Gemini.
+        structured_agent (Runnable): Gemini model bound to the `RiskOutput` schema.
+
+    Yields:
+        RiskOutput: Progressively more complete graph snapshots.
+    """
+    # The model takes a rate limit token itself when the request starts
+    async for chunk in structured_agent.astream(prompt):
+        if chunk is not None:
+            yield chunk
+
+
+@rate_limit_backoff
+async def invoke_llm(prompt: str, structured_agent: Runnable) -> RiskOutput:
     """
     Calls the Gemini model with structured output parsing.
 
-    Automatically retries on rate limit errors using exponential backoff.
+    Consumes `stream_llm` to completion and automatically retries on rate
+    limit errors; `rate_limit_backoff` does all the waiting, honoring the
+    server-suggested retry delay.
 
     Args:
         prompt (str): The formatted prompt string for Gemini.
-        llm (ChatGoogleGenerativeAI): LangChain-wrapped Gemini model.
+        structured_agent (Runnable): Gemini model bound to the `RiskOutput` schema.
 
     Returns:
         RiskOutput: Parsed graph structure with nodes and edges.
@@ -107,14 +198,220 @@ async def invoke_llm(prompt: str, llm: ChatGoogleGenerativeAI) -> RiskOutput:
     Raises:
         ResourceExhausted: If Gemini continues to return quota errors after retries.
     """
-    structured_agent = llm.with_structured_output(RiskOutput)
-    try:
-        return await asyncio.to_thread(structured_agent.invoke, prompt)
-    except ResourceExhausted as e:
-        retry_secs = extract_retry_seconds_from_error(e)
-        logging.warning(f"⏳ Rate limit hit. Retrying after {retry_secs}s...")
-        await asyncio.sleep(retry_secs)
-        raise e
+    response = None
+    async for response in stream_llm(prompt, structured_agent):
+        pass
+    if response is None:
+        raise ValueError("Gemini returned no structured output for the knowledge graph.")
+    return response
+
+
+def _prompt_key(prompt: str) -> str:
+    return hashlib.sha256(prompt.encode("utf-8")).hexdigest()
+
+
+async def _load_cached(key: str) -> Optional[RiskOutput]:
+    cached = await asyncio.to_thread(cache_get, "kg", key)
+    if cached is None:
+        return None
+    logger.info("♻️ Using cached knowledge graph for prompt %s", key[:12])
+    return RiskOutput.model_validate(cached)
+
+
+async def cached_invoke_llm(prompt: str, structured_agent: Runnable) -> RiskOutput:
+    """
+    Calls `invoke_llm`, reusing an on-disk result for an identical prompt.
+
+    Results are keyed by the SHA-256 of the full prompt and stored through
+    `agents._cache` under the "kg" stage; disk I/O runs in a worker thread.
+
+    Args:
+        prompt (str): The formatted prompt string for Gemini.
+        structured_agent (Runnable): Gemini model bound to the `RiskOutput` schema.
+
+    Returns:
+        RiskOutput: Parsed graph structure with nodes and edges.
+    """
+    key = _prompt_key(prompt)
+    cached = await _load_cached(key)
+    if cached is not None:
+        return cached
+
+    response = prune_dangling_links(await invoke_llm(prompt, structured_agent))
+    await asyncio.to_thread(cache_set, "kg", key, response.model_dump())
+    return response
+
+
+def merge_shard_outputs(outputs: List[RiskOutput]) -> RiskOutput:
+    """
+    Merges per-shard graphs into one graph with globally unique node IDs.
+
+    Each shard numbers its nodes from 1, so node IDs and link endpoints are
+    shifted by a running offset. Nodes whose name was already produced by an
+    earlier shard are collapsed into the first occurrence, and links are
+    remapped accordingly (self-loops and duplicates are dropped).
+
+    Args:
+        outputs (List[RiskOutput]): Graphs returned for each shard, in order.
+
+    Returns:
+        RiskOutput: The combined graph.
+    """
+    nodes: List[dict] = []
+    links: List[dict] = []
+    id_by_name: Dict[str, int] = {}
+    seen_links = set()
+    offset = 0
+
+    for output in outputs:
+        id_map: Dict[int, int] = {}
+        for node in output.nodes:
+            existing = id_by_name.get(node.name)
+            if existing is not None:
+                id_map[node.id] = existing
+                continue
+            new_id = node.id + offset
+            id_map[node.id] = new_id
+            id_by_name[sys.intern(node.name)] = new_id
+            nodes.append({"id": new_id, "name": node.name, "description": node.description})
+
+        for link in output.links:
+            source = id_map.get(link.source, link.source + offset)
+            target = id_map.get(link.target, link.target + offset)
+            if source != target and (source, target) not in seen_links:
+                seen_links.add((source, target))
+                links.append({"source": source, "target": target})
+
+        offset = max([offset] + [n["id"] for n in nodes])
+
+    # Validate each merged list in one pass; the wrapper needs no re-validation
+    return prune_dangling_links(RiskOutput.model_construct(
+        nodes=_NODES_ADAPTER.validate_python(nodes),
+        links=_LINKS_ADAPTER.validate_python(links),
+    ))
+
+
+def prune_dangling_links(output: RiskOutput) -> RiskOutput:
+    """
+    Drops links whose source or target is not the ID of a node in the graph.
+
+    Endpoint validity is computed for all links at once with `np.isin` on the
+    columnar form of the graph.
+
+    Args:
+        output (RiskOutput): Graph to check.
+
+    Returns:
+        RiskOutput: `output` itself if every link is valid, otherwise a copy
+            without the dangling links.
+    """
+    soa = output.to_soa()
+    valid = np.isin(soa["edge_src"], soa["node_ids"]) & np.isin(soa["edge_tgt"], soa["node_ids"])
+    if valid.all():
+        return output
+    logger.warning("⚠️ Dropped %d links pointing to unknown nodes", int((~valid).sum()))
+    links = [link for link, keep in zip(output.links, valid.tolist()) if keep]
+    return RiskOutput.model_construct(nodes=output.nodes, links=links)
+
+
+def dedupe_risks(risk_assessment: List[dict]) -> List[dict]:
+    """
+    Drops repeated risks before they are sent to Gemini.
+
+    Two entries are duplicates when their title and description match exactly
+    (a common result of re-running a category upstream). The first occurrence
+    is kept and input order is preserved.
+
+    Args:
+        risk_assessment (List[dict]): Risk objects with 'risk_title' (or
+            'title') and 'description' keys.
+
+    Returns:
+        List[dict]: The risks with exact duplicates removed.
+    """
+    seen = set()
+    unique: List[dict] = []
+    for risk in risk_assessment:
+        identity = _dumps_compact([risk.get("risk_title", risk.get("title")), risk.get("description")])
+        key = hashlib.blake2b(identity.encode("utf-8"), digest_size=16).digest()
+        if key not in seen:
+            seen.add(key)
+            unique.append(risk)
+    if len(unique) < len(risk_assessment):
+        logger.info("🧹 Dropped %d duplicate risks before graph generation", len(risk_assessment) - len(unique))
+    return unique
+
+
+# The parser prompt split around its single placeholder, computed once. Formatting
+# with a sentinel (instead of splitting the raw template) also resolves the
+# template's escaped `{{ }}` braces. Concatenating the payload afterwards means
+# braces inside the risk JSON are never interpreted by `str.format`.
+_PROMPT_SENTINEL = "\x00risk_assessment_input\x00"
+_PROMPT_PREFIX, _PROMPT_SUFFIX = RISK_PARSER_PROMPT.format(
+    risk_assessment_input=_PROMPT_SENTINEL
+).split(_PROMPT_SENTINEL, 1)
+
+
+def _build_prompt(risks: List[dict]) -> str:
+    return f"{_PROMPT_PREFIX}{_dumps_compact(risks)}{_PROMPT_SUFFIX}"
+
+
+async def create_knowledge_graph_stream_async(risk_assessment: List[dict]) -> AsyncIterator[RiskOutput]:
+    """
+    Streams a risk knowledge graph as it is generated.
+
+    For a single shard, partial graphs are yielded while Gemini is still
+    decoding. For multiple shards, the merged graph of all shards completed so
+    far (in shard order) is yielded each time a shard finishes. The last value
+    yielded is always the complete graph.
+
+    Args:
+        risk_assessment (List[dict]): A list of risk objects, each with keys
+            like 'title' and 'description'.
+
+    Yields:
+        RiskOutput: Progressively more complete graph snapshots.
+    """
+    risk_assessment = dedupe_risks(risk_assessment)
+    shards = [
+        risk_assessment[i:i + KG_SHARD_SIZE]
+        for i in range(0, len(risk_assessment), KG_SHARD_SIZE)
+    ] or [[]]
+    agent = _get_agent()
+
+    if len(shards) == 1:
+        prompt = _build_prompt(shards[0])
+        key = _prompt_key(prompt)
+        final = await _load_cached(key)
+        if final is None:
+            try:
+                async for final in stream_llm(prompt, agent):
+                    yield final
+            except ResourceExhausted:
+                if final is not None:
+                    raise
+                # Nothing streamed yet: fall back to the retrying call
+                final = await invoke_llm(prompt, agent)
+                yield final
+            if final is None:
+                raise ValueError("Gemini returned no structured output for the knowledge graph.")
+            pruned = prune_dangling_links(final)
+            if pruned is not final:
+                final = pruned
+                yield final
+            await asyncio.to_thread(cache_set, "kg", key, final.model_dump())
+        else:
+            yield final
+        return
+
+    async def run_shard(index: int, shard: List[dict]):
+        return index, await cached_invoke_llm(_build_prompt(shard), agent)
+
+    outputs: List[Optional[RiskOutput]] = [None] * len(shards)
+    for next_done in asyncio.as_completed([run_shard(i, shard) for i, shard in enumerate(shards)]):
+        index, output = await next_done
+        outputs[index] = output
+        yield merge_shard_outputs([o for o in outputs if o is not None])
 
 
 async def create_knowledge_graph_async(risk_assessment: List[dict]) -> RiskOutput:
@@ -122,7 +419,12 @@ async def create_knowledge_graph_async(risk_assessment: List[dict]) -> RiskOutpu
     Generates a risk knowledge graph from a list of risk descriptions.
 
     This function invokes Gemini's structured output parsing to convert
-    unstructured risk descriptions into graph-compatible format.
+    unstructured risk descriptions into graph-compatible format. Exact duplicate
+    risks are removed first (see `dedupe_risks`). Large inputs
+    are split into shards of `KG_SHARD_SIZE` risks that are processed
+    concurrently and merged; links are only inferred within a shard.
+
+    It collects `create_knowledge_graph_stream_async` and returns its final graph.
 
     Args:
         risk_assessment (List[dict]): A list of risk objects, each with keys
@@ -138,12 +440,11 @@ async def create_knowledge_graph_async(risk_assessment: List[dict]) -> RiskOutpu
         >>> ]
         >>> graph = await create_knowledge_graph_async(risk_data)
     """
-    llm = ChatGoogleGenerativeAI(model="gemini-2.5-flash")
-    prompt = RISK_PARSER_PROMPT.format(risk_assessment_input=str(risk_assessment))
-
-    start = time.time()
-    response = await invoke_llm(prompt, llm)
-    end = time.time()
-    print(f"✅ Knowledge graph generated in {end - start:.2f} seconds")
-
-    return response
+    start = time.perf_counter_ns()
+    response = None
+    async for response in create_knowledge_graph_stream_async(risk_assessment):
+        pass
+    elapsed_ms = (time.perf_counter_ns() - start) / 1e6
+    logger.info("✅ Knowledge graph generated in %.2f ms", elapsed_ms, extra={"ms": elapsed_ms})
+
+    return response  # type: ignore[return-value]
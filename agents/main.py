@@ -6,27 +6,51 @@ for triggering the agent pipeline and retrieving server logs.
 
 Endpoints:
     - POST /run_agent: Trigger the multi-agent risk and ESG analysis for a given company.
+    - POST /run_agent/stream: Same analysis, streamed per stage as Server-Sent Events.
     - GET /logs: Return in-memory logs of requests and events for the current day.
 
 Features:
     - Asynchronous I/O for non-blocking agent execution
-    - Thread-safe in-memory logging with daily rollover
+    - Bounded concurrent pipelines with a queue or fail (429) backpressure policy
+    - Lock-free in-memory logging (queue + background drainer) with daily rollover
     - CORS support for frontend integration (e.g., Streamlit, React)
 """
 
-from fastapi import FastAPI
-from agents.agent import run_agent
+from fastapi import FastAPI, HTTPException
+from agents.agent import run_agent, run_agent_stream
+from fastapi.encoders import jsonable_encoder
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import PlainTextResponse
+from fastapi.responses import StreamingResponse
+from collections import deque
+from contextlib import asynccontextmanager, suppress
 from datetime import datetime, date
-from threading import Lock
 from pydantic import BaseModel
+from typing import Tuple
+import asyncio
+import json
+import os
 import time
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Runs the background log drainer for the lifetime of the application.
+    """
+    drainer = asyncio.create_task(log_drainer())
+    try:
+        yield
+    finally:
+        drainer.cancel()
+        with suppress(asyncio.CancelledError):
+            await drainer
+
+
 app = FastAPI(
     title="InsightBestAI Risk API",
     description="API service for financial risk assessment and ESG insights using multi-agent architecture.",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan,
 )
 
 # CORS Middleware: Allow all origins for development
@@ -38,10 +62,30 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# In-memory log buffer for audit trail (rotated daily)
-log_buffer = []
+# Maximum number of log lines kept in memory; older lines are discarded
+LOG_BUFFER_SIZE = 10000
+
+# In-memory ring buffer for audit trail (rotated daily). Only `log_drainer`
+# writes to it; request handlers enqueue onto `log_queue` without locking.
+log_buffer: deque = deque(maxlen=LOG_BUFFER_SIZE)
 log_buffer_date = date.today()
-log_lock = Lock()
+# Messages waiting for the drainer; new ones are dropped while it is full
+log_queue: "asyncio.Queue[tuple[float, str]]" = asyncio.Queue(maxsize=LOG_BUFFER_SIZE)
+
+
+# Maximum number of agent pipelines running at once, and what to do with
+# requests beyond that: "queue" (wait for a slot) or "fail" (reply 429)
+MAX_INFLIGHT = int(os.getenv("RUN_AGENT_MAX_INFLIGHT", "2"))
+BACKPRESSURE = os.getenv("BACKPRESSURE", "queue").lower()
+
+# Seconds suggested to clients in the Retry-After header when rejected
+RETRY_AFTER_SECONDS = 60
+
+request_semaphore = asyncio.Semaphore(MAX_INFLIGHT)
+
+# Idle seconds after which a streaming response sends a keep-alive comment
+KEEPALIVE_SECONDS = 15
+KEEPALIVE_FRAME = ": keepalive\n\n"
 
 
 class AgentRequest(BaseModel):
@@ -60,17 +104,25 @@ async def call_agent(data: AgentRequest):
     Runs the risk and ESG analysis for a given company using the AI agent pipeline.
 
     This endpoint is asynchronous and logs both the start and completion of the request.
+    At most `MAX_INFLIGHT` pipelines run concurrently; with the "fail"
+    backpressure policy, requests beyond that are rejected instead of queued.
 
     Args:
         data (AgentRequest): JSON body containing the company name.
 
     Returns:
         dict: Structured response containing financial risks, ESG report, and knowledge graph.
+
+    Raises:
+        HTTPException: 429 when every slot is busy and the policy is "fail".
     """
     start_time = time.time()
     log_message(f"📥 Received request for company: {data.company_name}")
-    
-    response = await run_agent(data.company_name)
+
+    reject_if_busy(data.company_name)
+
+    async with request_semaphore:
+        response = await run_agent(data.company_name)
     
     end_time = time.time()
     elapsed = f"{end_time - start_time:.2f} seconds"
@@ -79,24 +131,244 @@ async def call_agent(data: AgentRequest):
     return response
 
 
+@app.post("/run_agent/stream")
+async def stream_agent(data: AgentRequest):
+    """
+    Runs the same pipeline as `/run_agent` but streams results as Server-Sent Events.
+
+    One event is sent per finished stage, named after its response key
+    (`esg_report`, `financial_risks`, `risk_graph`), followed by a final
+    `done` event, or by an `error` event if the pipeline fails. Headers go out
+    immediately, and a `: keepalive` comment is sent whenever nothing else
+    was sent for `KEEPALIVE_SECONDS`, including while waiting for a slot.
+
+    Args:
+        data (AgentRequest): JSON body containing the company name.
+
+    Returns:
+        StreamingResponse: A `text/event-stream` of stage results.
+
+    Raises:
+        HTTPException: 429 when every slot is busy and the policy is "fail".
+    """
+    log_message(f"📥 Received streaming request for company: {data.company_name}")
+    reject_if_busy(data.company_name)
+    # A free slot is taken before responding, so the "fail" policy sees this
+    # request; a queued request waits inside the stream, behind keep-alives
+    held = not request_semaphore.locked()
+    if held:
+        await request_semaphore.acquire()
+
+    def release_slot():
+        if held:
+            request_semaphore.release()
+
+    async def stages():
+        nonlocal held
+        if not held:
+            await request_semaphore.acquire()
+            held = True
+        async for key, value in run_agent_stream(data.company_name):
+            yield sse_event(key, value)
+
+    async def events():
+        start_time = time.time()
+        try:
+            async for frame in with_keepalive(stages()):
+                yield frame
+        except Exception as e:
+            log_message(f"❌ Streaming request for {data.company_name} failed: {e}")
+            yield sse_event("error", {"detail": str(e)})
+            return
+        elapsed = f"{time.time() - start_time:.2f} seconds"
+        log_message(f"✅ Completed streaming request for {data.company_name} in {elapsed}")
+        yield sse_event("done", {})
+
+    body = SlotReleasingStream(events(), release_slot)
+    return StreamingResponse(body, media_type="text/event-stream")
+
+
+async def with_keepalive(source):
+    """
+    Re-yields `source`, adding an SSE comment frame whenever it is idle.
+
+    Keeps proxies and client read timeouts from dropping a stream while a
+    stage runs for minutes without producing output.
+
+    Args:
+        source: Async iterator of SSE frames.
+
+    Yields:
+        str: Frames from `source`, interleaved with `KEEPALIVE_FRAME`.
+    """
+    iterator = source.__aiter__()
+    pending = asyncio.ensure_future(iterator.__anext__())
+    try:
+        while True:
+            done, _ = await asyncio.wait({pending}, timeout=KEEPALIVE_SECONDS)
+            if not done:
+                yield KEEPALIVE_FRAME
+                continue
+            try:
+                frame = pending.result()
+            except StopAsyncIteration:
+                return
+            yield frame
+            pending = asyncio.ensure_future(iterator.__anext__())
+    finally:
+        pending.cancel()
+
+
+class SlotReleasingStream:
+    """
+    Async iterator over a response body that frees a pipeline slot exactly once.
+
+    The slot is released when the body is exhausted, raises, is closed, or is
+    garbage-collected without ever being iterated (e.g. the client disconnected
+    before streaming started), so a request can never keep its slot forever.
+
+    Args:
+        body: The async iterator producing the response chunks.
+        release: Called once to give the slot back.
+    """
+
+    def __init__(self, body, release):
+        self._body = body
+        self._release = release
+        self._released = False
+
+    def release(self) -> None:
+        if not self._released:
+            self._released = True
+            self._release()
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        try:
+            return await self._body.__anext__()
+        except BaseException:
+            # StopAsyncIteration included: the stream is over either way
+            self.release()
+            raise
+
+    async def aclose(self) -> None:
+        self.release()
+        await self._body.aclose()
+
+    def __del__(self):
+        self.release()
+
+
+def reject_if_busy(company_name: str):
+    """
+    Applies the "fail" backpressure policy.
+
+    Args:
+        company_name (str): Company of the incoming request, for the log.
+
+    Raises:
+        HTTPException: 429 when every slot is busy and the policy is "fail".
+    """
+    if BACKPRESSURE == "fail" and request_semaphore.locked():
+        log_message(f"🚫 Rejected request for {company_name}: server busy")
+        raise HTTPException(
+            status_code=429,
+            detail={"error": "Too many analyses in progress", "retry_after": RETRY_AFTER_SECONDS},
+            headers={"Retry-After": str(RETRY_AFTER_SECONDS)},
+        )
+
+
+def sse_event(event: str, payload) -> str:
+    """
+    Formats one Server-Sent Event with a JSON payload.
+
+    Args:
+        event (str): Event name.
+        payload: Value to send; Pydantic models are converted like FastAPI responses.
+
+    Returns:
+        str: The event frame, terminated by a blank line.
+    """
+    data = json.dumps(jsonable_encoder(payload), ensure_ascii=False, separators=(",", ":"))
+    return f"event: {event}\ndata: {data}\n\n"
+
+
+@app.get("/logs", response_class=StreamingResponse)
+async def get_logs():
+    """
+    Streams the in-memory request log for the current day.
+
+    Lines are sent one by one from a snapshot instead of being joined into
+    one large string first.
+
+    Returns:
+        StreamingResponse: Plain-text log lines, oldest first.
+    """
+    # Snapshotting a deque is safe under the GIL; the drainer is the only writer
+    snapshot = list(log_buffer)
+    return StreamingResponse((line + "\n" for line in snapshot), media_type="text/plain")
+
+
 def log_message(message: str):
     """
-    Adds a timestamped message to the in-memory log buffer.
+    Queues a message for the in-memory log buffer.
 
-    Clears the log buffer if the current date has changed since last log entry.
+    The message is stamped with the current time here; formatting, daily
+    rotation and the append happen in `log_drainer`, off the request path.
+    If the drainer is not running or has fallen `LOG_BUFFER_SIZE` messages
+    behind, the message is dropped so memory stays bounded.
 
     Args:
         message (str): Message to append to the log.
     """
-    global log_buffer, log_buffer_date
-    with log_lock:
-        # Rotate log buffer daily
-        if date.today() != log_buffer_date:
-            log_buffer = []
-            log_buffer_date = date.today()
-        
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    with suppress(asyncio.QueueFull):
+        log_queue.put_nowait((time.time(), message))
+
+
+async def log_drainer():
+    """
+    Moves queued messages into the log buffer, one at a time.
+
+    Clears the log buffer when a message's date differs from the current
+    buffer date. Only the most recent `LOG_BUFFER_SIZE` messages are kept.
+    """
+    global log_buffer_date
+    while True:
+        created, message = await log_queue.get()
+        timestamp, day = _format_second(int(created))
+        # Rotate log buffer daily; clear in place so readers keep a valid reference
+        if day != log_buffer_date:
+            log_buffer.clear()
+            log_buffer_date = day
+
         log_buffer.append(f"[{timestamp}] {message}")
 
 
+# Last formatted second, reused while messages keep arriving within it
+_last_second = -1
+_last_second_str = ""
+_last_second_date = log_buffer_date
+
+
+def _format_second(second: int) -> Tuple[str, date]:
+    """
+    Formats a Unix second as local time, reusing the result for the same second.
+
+    Args:
+        second (int): Whole seconds since the epoch.
+
+    Returns:
+        Tuple[str, date]: "%Y-%m-%d %H:%M:%S" timestamp and the local date.
+    """
+    global _last_second, _last_second_str, _last_second_date
+    if second != _last_second:
+        moment = datetime.fromtimestamp(second)
+        _last_second = second
+        _last_second_str = moment.strftime("%Y-%m-%d %H:%M:%S")
+        _last_second_date = moment.date()
+    return _last_second_str, _last_second_date
+
+
 
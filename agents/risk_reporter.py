@@ -4,8 +4,9 @@ The agent analyzes financial risks for a given company across predefined categor
 with severity, impact, mitigation strategies, and supporting citations.
 
 Key Features:
-    - Multi-threaded execution using ThreadPoolExecutor
-    - Retry mechanism with exponential fallback for Gemini errors
+    - All categories assessed in one batched agent call (concurrent if split)
+    - Offline multi-company runs through the Gemini Batch API
+    - Bounded retries with jittered exponential backoff for Gemini errors
     - Strict output validation using Pydantic
     - Modular design with clean schema definitions
 """
@@ -13,26 +14,35 @@ Key Features:
 
 import time
 import re
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from typing import List, Literal, Optional
+import json
+import asyncio
+import tempfile
+from pathlib import Path
+from typing import Dict, List, Literal
 
 from tools.financial_year import get_current_financial_year
 from tools.google_search import grounded_search_tool
 from prompts_library.prompt import FINANCIAL_RISK_ASSESSMENT_PROMPT, RISK_CATEGORIES
+from agents._pool import AgentPool
+from agents._retry import MAX_TRIES, is_retryable, retry_wait_time
 
-from langchain_google_genai import ChatGoogleGenerativeAI  # type: ignore
+from google import genai
+from google.genai import types
 from langgraph.prebuilt import create_react_agent  # type: ignore
-from pydantic import BaseModel, Field  # type: ignore
-
-# Initialize Gemini language model
-llm = ChatGoogleGenerativeAI(
-    model="gemini-2.5-flash"
-)
+from pydantic import BaseModel, Field, TypeAdapter  # type: ignore
+from google.api_core.exceptions import ResourceExhausted
 
 # =========================
 # ✅ Pydantic Output Schema
 # =========================
 
+# Closed vocabularies for the LLM-facing schema; Gemini receives them as JSON
+# schema enums, so invalid values are rejected during constrained decoding.
+Severity = Literal["High", "Medium", "Low"]
+
+# Mirrors `RISK_CATEGORIES` in prompts_library.prompt; keep the two in sync
+RiskCategory = Literal["ALL", "Operational Risk", "Credit Risk", "Compliance Risk", "Strategic Risk"]
+
 class Citation(BaseModel):
     """
     Represents a citation reference for a financial risk analysis.
@@ -52,125 +62,322 @@ class FinancialRiskAssessment(BaseModel):
     Attributes:
         risk_title (str): Name or label of the identified risk.
         description (str): Plain-text explanation of the risk.
-        risk_category (List[str]): One or more categories this risk falls into.
-        severity (Literal): Severity level as High, Medium, or Low.
+        risk_category (List[RiskCategory]): One or more categories this risk falls into.
+        severity (Severity): Severity level as High, Medium, or Low.
         mitigation (str): Suggested mitigation steps in plain text.
         impact (str): Description of how the risk may impact the company.
         citations (List[Citation]): Supporting sources or references.
     """
     risk_title: str
     description: str
-    risk_category: List[str]
-    severity: Literal["High", "Medium", "Low"]
+    risk_category: List[RiskCategory]
+    severity: Severity
     mitigation: str
     impact: str
     citations: List[Citation]
 
 
+class FinancialRiskAssessmentBatch(BaseModel):
+    """
+    Structured output schema for one agent call covering several risk categories.
+
+    Attributes:
+        items (List[FinancialRiskAssessment]): One assessment per requested category.
+    """
+    items: List[FinancialRiskAssessment]
+
+
+# Dumps a whole list of assessments in one pass instead of per-model model_dump()
+_ITEMS_ADAPTER = TypeAdapter(List[FinancialRiskAssessment])
+
+# Maximum number of categories assessed in a single agent call; larger lists
+# are split into several calls that run concurrently
+RISK_BATCH_SIZE = 8
+
+
 # =========================
 # ✅ LangGraph ReAct Agent
 # =========================
 
-# Agent that uses Google Gemini + grounded search to output structured risk analysis
-agent = create_react_agent(
-    model=llm,
+# Agents that use Google Gemini + grounded search to output structured risk
+# analysis; one per configured API key, compiled on first use. The agents are
+# driven with `ainvoke`; the synchronous `grounded_search_tool` is run by
+# LangGraph in the event loop's default executor, so no dedicated thread pool
+# is needed to keep the FastAPI loop unblocked.
+AGENT_POOL = AgentPool(lambda model: create_react_agent(
+    model=model,
     tools=[grounded_search_tool],
-    response_format=FinancialRiskAssessment
-)
+    response_format=FinancialRiskAssessmentBatch
+))
 
 # =========================
-# ✅ Retry Handler
+# ✅ Prompt Template
 # =========================
 
-def extract_retry_seconds_from_error(e: Exception) -> Optional[int]:
+# FINANCIAL_RISK_ASSESSMENT_PROMPT partially evaluated once: the constant
+# `risk_categories` list and the escaped `{{ }}` braces are rendered at import,
+# leaving literal pieces interleaved with the per-call field names.
+_PROMPT_FIELDS = ("requested_categories", "company_name", "financial_year")
+_PROMPT_PIECES = re.split(
+    "\x00(" + "|".join(_PROMPT_FIELDS) + ")\x00",
+    FINANCIAL_RISK_ASSESSMENT_PROMPT.format(
+        risk_categories=RISK_CATEGORIES,
+        **{field: f"\x00{field}\x00" for field in _PROMPT_FIELDS},
+    ),
+)
+
+
+def _render_prompt(categories: List[str], company_name: str) -> str:
     """
-    Extracts the retry delay from a Gemini API error message, if present.
+    Renders the risk prompt by concatenating precomputed pieces.
 
     Args:
-        e (Exception): The exception raised by the Gemini call.
+        categories (List[str]): The risk categories requested in this call.
+        company_name (str): The target company name.
 
     Returns:
-        Optional[int]: The number of seconds to wait before retrying.
+        str: The same text as formatting `FINANCIAL_RISK_ASSESSMENT_PROMPT` directly.
     """
-    match = re.search(r"retry_delay\\s*{\\s*seconds: \\s*(\\d+)", str(e))
-    if match:
-        return int(match.group(1))
-    return None
+    values = {
+        "requested_categories": str(categories),
+        "company_name": company_name,
+        "financial_year": get_current_financial_year(),
+    }
+    # re.split puts captured field names at the odd indices
+    return "".join(values[piece] if i % 2 else piece for i, piece in enumerate(_PROMPT_PIECES))
 
 # =========================
 # ✅ Worker Function
 # =========================
 
-def process_category(category: str, company_name: str) -> dict:
+async def process_categories(categories: List[str], company_name: str) -> dict:
     """
-    Processes a single risk category by invoking the agent with a tailored prompt.
+    Assesses several risk categories with a single agent call.
+
+    One ReAct loop and one copy of the prompt prefix cover every category in
+    `categories`, instead of paying both once per category.
 
-    Includes a retry mechanism to handle API rate limits and other transient failures.
+    Failures are retried at most `MAX_TRIES` times with capped, jittered
+    exponential backoff (honoring Gemini's suggested delay), after which an
+    error dict is returned for the batch. Agents are taken round-robin from `AGENT_POOL`, and pacing comes from the
+    member's rate limiter, which its model consults on every request, rather
+    than a fixed sleep; a 429 penalizes that limiter for every caller.
 
     Args:
-        category (str): The financial risk category to analyze.
+        categories (List[str]): The financial risk categories to analyze.
         company_name (str): The target company name.
 
     Returns:
-        dict: Output structure including category, parsed output, and response time.
+        dict: Output structure including categories, parsed outputs, and response time.
     """
-    prompt = FINANCIAL_RISK_ASSESSMENT_PROMPT.format(
-        risk_categories=RISK_CATEGORIES,
-        risk_category=category,
-        company_name=company_name,
-        financial_year=get_current_financial_year()
-    )
+    prompt = _render_prompt(categories, company_name)
 
-    retry_count = 0
-    while True:
+    for attempt in range(MAX_TRIES):
+        member = None
         try:
-            time.sleep(7)  # Prevent rapid API spamming
-            start = time.time()
-            response = agent.invoke({"messages": [{"role": "user", "content": prompt}]})
+            async with AGENT_POOL.acquire() as member:
+                start = time.time()
+                response = await member.agent.ainvoke({"messages": [{"role": "user", "content": prompt}]})
             end = time.time()
             return {
-                "category": category,
-                "output": response["structured_response"].model_dump(),
+                "categories": categories,
+                "output": _ITEMS_ADAPTER.dump_python(response["structured_response"].items),
                 "time": end - start
             }
         except Exception as e:
-            retry_delay = extract_retry_seconds_from_error(e) or 20
-            retry_count += 1
-            print(f"\n🔁 Retrying {category} in {retry_delay} seconds (Attempt {retry_count})...")
-            time.sleep(retry_delay)
+            if isinstance(e, ResourceExhausted) and not is_retryable(e):
+                # Daily quota exhausted: retrying within this run cannot succeed
+                return {"categories": categories, "error": str(e)}
+            if attempt >= MAX_TRIES - 1:
+                return {"categories": categories, "error": str(e)}
+            retry_delay = retry_wait_time(e, attempt)
+            if isinstance(e, ResourceExhausted) and member is not None:
+                member.limiter.penalize(retry_delay)
+            print(f"\n🔁 Retrying {categories} in {retry_delay:.1f} seconds (Attempt {attempt + 1})...")
+            await asyncio.sleep(retry_delay)
+    return {"categories": categories, "error": "no attempts made"}  # only if MAX_TRIES < 1
 
 # =========================
 # ✅ Main Agent Executor
 # =========================
 
-def fin_risk_agent(company_name: str) -> List[dict]:
+def _batches(categories: List[str]) -> List[List[str]]:
+    return [categories[i:i + RISK_BATCH_SIZE] for i in range(0, len(categories), RISK_BATCH_SIZE)]
+
+
+def _report(result: dict) -> bool:
+    """
+    Prints the outcome of one batch and tells whether it succeeded.
+
+    Args:
+        result (dict): Value returned by `process_categories`.
+
+    Returns:
+        bool: True if the result carries an output.
+    """
+    if "error" in result:
+        print(f"\n❌ {result['categories']} failed: {result['error']}")
+        return False
+    print(f"\n✅ {result['categories']} took {result['time']:.2f} seconds")
+    return True
+
+
+async def fin_risk_agent(company_name: str) -> List[dict]:
     """
     Main entry point to run financial risk assessment across all defined categories.
 
-    Executes each category in parallel using threads and aggregates structured responses.
+    All categories are normally covered by one agent call; if there are more
+    than `RISK_BATCH_SIZE`, the batches run concurrently with `asyncio.gather`.
 
     Args:
         company_name (str): The name of the company for which to assess risks.
 
     Returns:
-        List[dict]: List of structured financial risk assessments per category.
-    """
-    results, response = [], []
-    with ThreadPoolExecutor(max_workers=1) as executor:
-        futures = [executor.submit(process_category, cat, company_name) for cat in RISK_CATEGORIES]
-        for future in as_completed(futures):
-            result = future.result()
-            results.append(result)
-            if "error" in result:
-                print(f"\n❌ {result['category']} failed: {result['error']}")
-            else:
-                print(f"\n✅ {result['category']} took {result['time']:.2f} seconds")
-                response.append(result["output"])
-                print("\n\n\n\n")
-    return response
+        List[dict]: List of structured financial risk assessments, in `RISK_CATEGORIES` order.
+    """
+    batches = _batches(RISK_CATEGORIES)
+    results = await asyncio.gather(
+        *[process_categories(batch, company_name) for batch in batches],
+        return_exceptions=True,
+    )
+    risks = []
+    for batch, result in zip(batches, results):
+        if isinstance(result, BaseException):
+            result = {"categories": batch, "error": str(result)}
+        if _report(result):
+            risks.extend(result["output"])
+    return risks
+
+
+# =========================
+# ✅ Offline Batch Executor
+# =========================
+
+# Model and polling interval (seconds) for Gemini Batch API jobs
+BATCH_MODEL = "gemini-2.5-flash"
+BATCH_POLL_SECONDS = 30
+
+# Terminal states of a Gemini batch job
+_BATCH_DONE_STATES = {"JOB_STATE_SUCCEEDED", "JOB_STATE_FAILED", "JOB_STATE_CANCELLED", "JOB_STATE_EXPIRED"}
+
+
+def _batch_request(company_name: str, categories: List[str]) -> dict:
+    """
+    Builds one JSONL row for the Gemini Batch API.
+
+    Batch jobs cannot run the LangGraph ReAct loop, so each row enables
+    Gemini's native Google Search grounding and relies on the prompt's strict
+    JSON instructions instead of `response_format`.
+
+    Args:
+        company_name (str): The target company name.
+        categories (List[str]): The financial risk categories to analyze.
+
+    Returns:
+        dict: Row with a `key` of the form "company|category,category" and the request body.
+    """
+    prompt = _render_prompt(categories, company_name)
+    return {
+        "key": f"{company_name}|{','.join(categories)}",
+        "request": {
+            "contents": [{"role": "user", "parts": [{"text": prompt}]}],
+            "tools": [{"google_search": {}}],
+        },
+    }
+
+
+def _parse_batch_row(row: dict) -> List[dict]:
+    """
+    Extracts the risk assessments from one line of a batch result file.
+
+    Args:
+        row (dict): Parsed result line with `response` or `error`.
+
+    Returns:
+        List[dict]: Validated assessments, or an empty list if the row failed.
+    """
+    if "error" in row:
+        print(f"\n❌ {row.get('key')} failed: {row['error']}")
+        return []
+    try:
+        parts = row["response"]["candidates"][0]["content"]["parts"]
+        text = "".join(part.get("text", "") for part in parts).strip()
+        # Gemini sometimes wraps JSON in a markdown fence despite the prompt
+        text = text.removeprefix("```json").removeprefix("```").removesuffix("```").strip()
+        batch = FinancialRiskAssessmentBatch.model_validate_json(text)
+    except Exception as e:
+        print(f"\n❌ {row.get('key')} returned unparseable output: {e}")
+        return []
+    return _ITEMS_ADAPTER.dump_python(batch.items)
+
+
+def fin_risk_agent_batch(companies: List[str]) -> Dict[str, List[dict]]:
+    """
+    Runs the financial risk assessment for many companies through the Gemini Batch API.
+
+    Every (company, category batch) prompt is written to a JSONL file,
+    uploaded and submitted as one batch job, which is then polled until it
+    finishes. Batch jobs are billed at a discount and do not count against the
+    live RPM quota, at the cost of latency, so use this for offline or bulk
+    runs; the FastAPI route keeps using `fin_risk_agent`.
+
+    Args:
+        companies (List[str]): Names of the companies to assess.
+
+    Returns:
+        Dict[str, List[dict]]: Per company, the same list shape `fin_risk_agent` returns.
+
+    Raises:
+        RuntimeError: If the batch job does not succeed.
+    """
+    client = genai.Client()
+    rows = [
+        _batch_request(company, batch)
+        for company in companies
+        for batch in _batches(RISK_CATEGORIES)
+    ]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "fin_risk_batch.jsonl"
+        path.write_text("\n".join(json.dumps(row, ensure_ascii=False) for row in rows), encoding="utf-8")
+        uploaded = client.files.upload(
+            file=path,
+            config=types.UploadFileConfig(display_name="fin-risk-batch", mime_type="jsonl"),
+        )
+
+    job = client.batches.create(
+        model=BATCH_MODEL,
+        src=uploaded.name,
+        config={"display_name": f"fin-risk-{get_current_financial_year()}"},
+    )
+    print(f"\n📦 Submitted batch {job.name} with {len(rows)} requests")
+
+    while job.state.name not in _BATCH_DONE_STATES:
+        time.sleep(BATCH_POLL_SECONDS)
+        job = client.batches.get(name=job.name)
+    if job.state.name != "JOB_STATE_SUCCEEDED":
+        raise RuntimeError(f"Batch {job.name} ended in {job.state.name}: {job.error}")
+
+    results: Dict[str, List[dict]] = {company: [] for company in companies}
+    content = client.files.download(file=job.dest.file_name).decode("utf-8")
+    rows_by_key = {}
+    for line in content.splitlines():
+        if line.strip():
+            row = json.loads(line)
+            rows_by_key[row.get("key")] = row
+    # Reassemble in request order so each company's list follows RISK_CATEGORIES
+    for request in rows:
+        row = rows_by_key.get(request["key"], {"key": request["key"], "error": "missing from batch output"})
+        company = request["key"].split("|", 1)[0]
+        results[company].extend(_parse_batch_row(row))
+    return results
 
 
 if __name__ == "__main__":
-    import json
-    # Example usage for manual testing
-    print(json.dumps(fin_risk_agent("MRF Tyres"), indent=4))
+    import sys
+    from prompts_library.prompt import COMPANY_NAMES
+    # Example usage for manual testing; `--batch` runs every company offline
+    if "--batch" in sys.argv:
+        print(json.dumps(fin_risk_agent_batch(COMPANY_NAMES), indent=4))
+    else:
+        print(json.dumps(asyncio.run(fin_risk_agent("MRF Tyres")), indent=4))
@@ -1,6 +1,12 @@
 import streamlit as st
 from streamlit.components.v1 import html
 import colorsys
+import json
+
+try:
+    import orjson  # type: ignore
+except ImportError:  # optional speed-up; fall back to the stdlib encoder
+    orjson = None
 
 def generate_distinct_colors(n):
     colors = []
@@ -12,8 +18,21 @@ def generate_distinct_colors(n):
         colors.append(f"rgb({int(rgb[0]*255)},{int(rgb[1]*255)},{int(rgb[2]*255)})")
     return colors
 
-def get_graph(graphData : dict):
-    d3_graph_code = """<!DOCTYPE html>
+def to_js_literal(value) -> str:
+    # JSON is a valid JS literal; escape "</" so data cannot close the <script> tag
+    if orjson is not None:
+        text = orjson.dumps(value).decode()
+    else:
+        text = json.dumps(value, separators=(",", ":"), ensure_ascii=False)
+    return text.replace("</", "<\\/")
+
+# The palette is constant, so build it (and its template text) once per process
+NODE_COLORS_20 = generate_distinct_colors(20)
+NODE_COLORS_20_STR = to_js_literal(NODE_COLORS_20)
+
+# Page template for the graph, built once per process. It is split at import
+# around its two placeholders, graph data first and node colors second.
+D3_GRAPH_TEMPLATE = """<!DOCTYPE html>
 <html>
 <head>
     <script src="https://d3js.org/d3.v7.min.js"></script>
@@ -217,9 +236,12 @@ def get_graph(graphData : dict):
 </body>
 </html>
 """
-    
+_D3_TEMPLATE_A, _rest = D3_GRAPH_TEMPLATE.split("{{graphData}}", 1)
+_D3_TEMPLATE_B, _D3_TEMPLATE_C = _rest.split("{{NODE_COLORS}}", 1)
+del _rest
 
+def get_graph(graphData : dict):
     st.title(" Risk Category Inter-Dependency Visualization")
-    node_colors = generate_distinct_colors(20)
-    final_code = d3_graph_code.replace("{{NODE_COLORS}}", str(node_colors)).replace("{{graphData}}", str(graphData))
+    # Single pass: three constant slabs joined with the two JSON snippets
+    final_code = f"{_D3_TEMPLATE_A}{to_js_literal(graphData)}{_D3_TEMPLATE_B}{NODE_COLORS_20_STR}{_D3_TEMPLATE_C}"
     return html(final_code, height=700)
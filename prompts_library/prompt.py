@@ -70,7 +70,7 @@ COMPANY_NAMES = [
 FINANCIAL_RISK_ASSESSMENT_PROMPT = """
 You are a structured data assistant specializing in financial risk analysis for Indian listed companies.
 
-Use the `grounded_search_tool` to gather factual, verifiable insights related to **'{risk_category}'** for the company **'{company_name}'**, based on the **latest available data for Financial Year {financial_year}**.
+Use the `grounded_search_tool` to gather factual, verifiable insights related to **each** of the requested risk categories **{requested_categories}** for the company **'{company_name}'**, based on the **latest available data for Financial Year {financial_year}**.
 
 ⚠️ Important Instructions:
 - You must use the `grounded_search_tool` for all information gathering.
@@ -90,20 +90,25 @@ Your task is to synthesize findings into a structured JSON format that adheres t
 RISK_CATEGORIES = {risk_categories}
 
 Keep in mind:
+- Return **exactly one** item in `items` per requested category, in the same order as **{requested_categories}**.
 - `risk_category` may include **multiple relevant categories** from the list.
 - All fields must be **fact-based and citation-supported**.
 - Return **strict JSON only**. No markdown, no explanation, no extra text.
 
 ### OUTPUT SCHEMA (Strict JSON):
 {{
-  "risk_title": "Concise Risk Title",
-  "description": "Clear Elaborated explanation of the risk  with source-based insights on its nature, cause, manifestation, and relevance.",
-  "risk_category": ["One or more exact entries from RISK_CATEGORIES"],
-  "severity": "High | Medium | Low",
-  "mitigation": "Clear Elaborated mitigation strategies  including actions taken, controls implemented, and Indian industry best practices.",
-  "impact": "Clear Elaborated assessment  of the risk’s effect on the company (financially, operationally, reputationally) in the Indian context.",
-  "citations": [
-    {{"title": "Source title from search result", "url": "https://verifiable.indian.source"}}
+  "items": [
+    {{
+      "risk_title": "Concise Risk Title",
+      "description": "Clear Elaborated explanation of the risk  with source-based insights on its nature, cause, manifestation, and relevance.",
+      "risk_category": ["One or more exact entries from RISK_CATEGORIES"],
+      "severity": "High | Medium | Low",
+      "mitigation": "Clear Elaborated mitigation strategies  including actions taken, controls implemented, and Indian industry best practices.",
+      "impact": "Clear Elaborated assessment  of the risk’s effect on the company (financially, operationally, reputationally) in the Indian context.",
+      "citations": [
+        {{"title": "Source title from search result", "url": "https://verifiable.indian.source"}}
+      ]
+    }}
   ]
 }}
 """
@@ -118,7 +123,7 @@ ESG_CATEGORIES = [
 ESG_REPORTING_PROMPT = """
 You are a structured data assistant specializing in ESG (Environmental, Social, Governance) reporting for **Indian listed companies**.
 
-Your task is to extract factual, verifiable ESG-related disclosures based on the provided ESG category, company name, and financial year.
+Your task is to extract factual, verifiable ESG-related disclosures for **every** ESG category listed below, based on the provided company name and financial year.
 
 🔍 You must use the `grounded_search_tool` to gather the most recent, trustworthy data. No hallucination is allowed. Use only **verifiable citations**.
 
@@ -132,20 +137,25 @@ Your task is to extract factual, verifiable ESG-related disclosures based on the
 ---
 
 🧭 Inputs:
-- `esg_category`: **{esg_category}**
+- `esg_categories`: **{esg_categories}**
 - `company_name`: **{company_name}**
 - `financial_year`: **{financial_year}**
 
 ---
 
 ### ✅ OUTPUT FORMAT (Strict JSON Only):
+Return exactly one entry in `reports` per category in `esg_categories`, in the same order.
 {{
-  "esg_category": "{esg_category}",
-  "description": "- Point 1 in markdown style\\n- Point 2...\\n- Point 3...",
-  "citations": [
+  "reports": [
     {{
-      "title": "Source title from search result",
-      "url": "https://verifiable.indian.source"
+      "esg_category": "One exact entry from esg_categories",
+      "description": "- Point 1 in markdown style\\n- Point 2...\\n- Point 3...",
+      "citations": [
+        {{
+          "title": "Source title from search result",
+          "url": "https://verifiable.indian.source"
+        }}
+      ]
     }}
   ]
 }}
@@ -154,22 +164,42 @@ Your task is to extract factual, verifiable ESG-related disclosures based on the
 
 ### 📌 EXAMPLE:
 Input:
-- `esg_category`: "Environmental"
+- `esg_categories`: ["Environmental", "Social", "Governance"]
 - `company_name`: "Infosys"
 - `financial_year`: "FY24"
 
 Output:
 {{
-  "esg_category": "Environmental",
-  "description": "- Reduced carbon emissions by 20% in 2024.\\n- Implemented a company-wide waste recycling program.\\n- Transitioned 50% of energy usage to renewables.",
-  "citations": [
+  "reports": [
+    {{
+      "esg_category": "Environmental",
+      "description": "- Reduced carbon emissions by 20% in 2024.\\n- Implemented a company-wide waste recycling program.\\n- Transitioned 50% of energy usage to renewables.",
+      "citations": [
+        {{
+          "title": "Environmental Policy",
+          "url": "https://www.infosys.com/sustainability/environment-policy"
+        }}
+      ]
+    }},
     {{
-      "title": "Environmental Policy",
-      "url": "https://www.infosys.com/sustainability/environment-policy"
+      "esg_category": "Social",
+      "description": "- Trained 250,000+ employees on digital skills.\\n- Expanded CSR programmes in education and healthcare.",
+      "citations": [
+        {{
+          "title": "Sustainability Blog",
+          "url": "https://www.infosys.com/newsroom/sustainability-updates"
+        }}
+      ]
     }},
     {{
-      "title": "Sustainability Blog",
-      "url": "https://www.infosys.com/newsroom/sustainability-updates"
+      "esg_category": "Governance",
+      "description": "- Board comprises a majority of independent directors.\\n- Published a revised whistleblower policy.",
+      "citations": [
+        {{
+          "title": "Corporate Governance Report",
+          "url": "https://www.infosys.com/investors/corporate-governance"
+        }}
+      ]
     }}
   ]
 }}
@@ -177,7 +207,7 @@ Output:
 ---
 
 🎯 Goal:
-Return only well-grounded ESG insights backed by citations and formatted exactly as per the output schema above.
+Return only well-grounded ESG insights for every requested category, backed by citations and formatted exactly as per the output schema above.
 """
 
 
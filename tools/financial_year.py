@@ -5,6 +5,15 @@ Utility to determine the current financial year in the format used for Indian fi
 """
 
 from datetime import date
+from functools import lru_cache
+
+
+@lru_cache(maxsize=2)
+def _financial_year_for(day: int) -> str:
+    today = date.fromordinal(day)
+    # January, February, and March are part of the previous FY
+    return f"FY{today.year - (today.month < 4)}"
+
 
 def get_current_financial_year() -> str:
     """
@@ -15,17 +24,12 @@ def get_current_financial_year() -> str:
         - If today is July 22, 2025 => Returns "FY2025"
         - If today is February 5, 2025 => Returns "FY2024"
 
+    The result is cached per calendar day, so repeated calls only compare dates.
+
     Returns:
         str: A string representing the financial year, e.g., "FY2025"
     """
-    today = date.today()
-    year = today.year
-    if today.month < 4:
-        # January, February, and March are part of the previous FY
-        return f"FY{year - 1}"
-    else:
-        # April onwards is the current FY
-        return f"FY{year}"
+    return _financial_year_for(date.today().toordinal())
 
 # Example usage:
 # print(get_current_financial_year())  # Output: 'FY2025' if today is in July 2025
@@ -15,7 +15,11 @@ Dependencies:
 """
 
 import json
+import atexit
 import asyncio
+import threading
+from collections import OrderedDict
+from functools import lru_cache
 import httpx
 from dotenv import load_dotenv
 load_dotenv()
@@ -24,6 +28,176 @@ from google import genai
 from google.genai import types
 from langchain.tools import tool  # type: ignore
 
+from agents._llm import ACTIVE_KEY_INDEX, MODEL_NAME, gemini_api_keys, key_limiter
+
+# Resolved grounding URLs (None for dead links), most recently used last
+URL_CACHE_SIZE = 4096
+_url_cache: "OrderedDict[str, dict | None]" = OrderedDict()
+
+# Maximum concurrent HEAD requests per tool call
+MAX_URL_CHECKS = 32
+
+# Fail fast on unreachable hosts and on slow responses
+URL_CHECK_TIMEOUT = httpx.Timeout(2.0, connect=1.0, pool=1.0)
+
+# Process-wide HTTP client for URL checks, so keep-alive connections are reused
+# across tool calls. An httpx client is tied to the event loop it first ran on,
+# so it is rebuilt only if it is ever driven from a different loop; normally
+# everything runs on the persistent `_LOOP` below.
+_http: httpx.AsyncClient | None = None
+_http_loop: asyncio.AbstractEventLoop | None = None
+
+
+def _get_http() -> httpx.AsyncClient:
+    global _http, _http_loop
+    loop = asyncio.get_running_loop()
+    if _http is None or _http_loop is not loop:
+        _http = httpx.AsyncClient(
+            limits=httpx.Limits(max_connections=1024, max_keepalive_connections=256),
+            timeout=URL_CHECK_TIMEOUT,
+            follow_redirects=True,
+        )
+        _http_loop = loop
+    return _http
+
+
+# One event loop for the tool's async work, running forever in a daemon thread.
+# Reusing it avoids creating a loop per call and keeps the pooled connections
+# of `_http` alive between calls.
+_LOOP = asyncio.new_event_loop()
+_loop_thread: threading.Thread | None = None
+_loop_lock = threading.Lock()
+
+
+def _run(coro):
+    """
+    Runs a coroutine on the persistent background loop and waits for its result.
+
+    Safe to call from any thread, including one that already runs its own loop
+    (the tool is synchronous and LangGraph calls it from worker threads).
+    """
+    global _loop_thread
+    with _loop_lock:
+        if _loop_thread is None:
+            _loop_thread = threading.Thread(target=_LOOP.run_forever, name="grounded-search-loop", daemon=True)
+            _loop_thread.start()
+    return asyncio.run_coroutine_threadsafe(coro, _LOOP).result()
+
+
+@atexit.register
+def _close_http() -> None:
+    if _http is not None and _loop_thread is not None and _LOOP.is_running():
+        try:
+            asyncio.run_coroutine_threadsafe(_http.aclose(), _LOOP).result(timeout=5)
+        except Exception:
+            pass
+
+
+def _cache_url(uri: str, result: dict | None) -> None:
+    _url_cache[uri] = result
+    _url_cache.move_to_end(uri)
+    if len(_url_cache) > URL_CACHE_SIZE:
+        _url_cache.popitem(last=False)
+
+
+@lru_cache(maxsize=None)
+def _get_genai_client(key_index: int = 0) -> genai.Client:
+    """
+    Returns the process-wide Gemini client for one configured API key, built on first use.
+    """
+    return genai.Client(api_key=gemini_api_keys()[key_index])
+
+
+# Google Search grounding config, identical for every call
+_GROUNDING_CONFIG = types.GenerateContentConfig(tools=[types.Tool(google_search=types.GoogleSearch())])
+
+
+async def resolve_real_url(session: httpx.AsyncClient, chunk, limit: asyncio.Semaphore) -> dict | None:
+    """
+    Resolve and validate a real URL from a web grounding chunk using an HTTP HEAD request.
+
+    Results (including dead links) are cached per URI, so repeated
+    grounding chunks cost no network round trip.
+
+    Args:
+        session (httpx.AsyncClient): Active async HTTP client.
+        chunk (types.WebGroundingChunk): Web chunk object from Gemini.
+        limit (asyncio.Semaphore): Caps concurrent HEAD requests.
+
+    Returns:
+        dict: {"title": ..., "uri": ...} if valid, else None.
+    """
+    uri = chunk.web.uri
+    title = chunk.web.title
+    if uri in _url_cache:
+        _url_cache.move_to_end(uri)
+        cached = _url_cache[uri]
+        return None if cached is None else {"title": title, "uri": cached["uri"]}
+
+    result = None
+    try:
+        async with limit:
+            resp = await session.head(uri)
+        if resp.status_code < 400:
+            result = {"title": title, "uri": str(resp.url)}
+    except Exception:
+        pass
+    _cache_url(uri, result)
+    return result
+
+
+async def grounded_search(user_prompt: str, key_index: int = 0) -> dict:
+    """
+    Async implementation of `grounded_search_tool`.
+
+    Streams grounded content from Gemini's async API and starts validating
+    each grounding URL as soon as the chunk carrying it arrives, so the
+    HEAD checks overlap with the rest of the generation.
+
+    Args:
+        user_prompt (str): The query or topic to search.
+        key_index (int): Gemini API key to bill, as an index into `gemini_api_keys()`.
+
+    Returns:
+        dict: {"text": str, "grounding_chunks": List[dict]}
+    """
+    limit = asyncio.Semaphore(MAX_URL_CHECKS)
+    session = _get_http()
+    text_parts = []
+    tasks = []
+    seen = set()
+
+    # Step 1: Stream grounded content, resolving URLs as they appear. The
+    # search counts against the same Gemini quota as the agents' own calls.
+    async with key_limiter(key_index):
+        stream = await _get_genai_client(key_index).aio.models.generate_content_stream(
+            model=MODEL_NAME,
+            contents=user_prompt,
+            config=_GROUNDING_CONFIG,
+        )
+        async for part in stream:
+            if part.text:
+                text_parts.append(part.text)
+            try:
+                chunks = part.candidates[0].grounding_metadata.grounding_chunks or []  # type: ignore
+            except (AttributeError, IndexError, TypeError):
+                continue
+            for chunk in chunks:
+                web = getattr(chunk, "web", None)
+                if web is not None and web.uri not in seen:
+                    seen.add(web.uri)
+                    tasks.append(asyncio.create_task(resolve_real_url(session, chunk, limit)))
+
+    # Step 2: Collect the validated URLs in the order Gemini cited them
+    resolved = await asyncio.gather(*tasks)
+    response = {
+        "text": "".join(text_parts),
+        "grounding_chunks": [r for r in resolved if r is not None]
+    }
+
+    return response
+
+
 @tool("grounded_search_tool", return_direct=False)
 def grounded_search_tool(user_prompt: str) -> dict:
     """
@@ -50,77 +224,13 @@ def grounded_search_tool(user_prompt: str) -> dict:
 
     Note:
         - Only web sources that resolve with HTTP < 400 are returned.
-        - Timeout for each HEAD request is 5 seconds.
-        - Uses asyncio to parallelize URL validation.
+        - Timeout for each HEAD request is 2 seconds (1 second to connect).
+        - Resolved URLs are cached per process, up to `URL_CACHE_SIZE` entries.
+        - Gemini output is streamed on a persistent background loop; URL checks
+          start as grounding chunks arrive and run concurrently.
     """
-    
-    # Step 1: Setup Gemini Client with Web Grounding
-    client = genai.Client()
-    grounding_tool = types.Tool(google_search=types.GoogleSearch())
-    config = types.GenerateContentConfig(tools=[grounding_tool])
-
-    # Step 2: Generate grounded content
-    raw_response = client.models.generate_content(
-        model="gemini-2.5-flash",
-        contents=user_prompt,
-        config=config,
-    )
-
-    # Initialize response container
-    response = {
-        "text": raw_response.text,
-        "grounding_chunks": []
-    }
-
-    async def resolve_real_url(session: httpx.AsyncClient, chunk) -> dict | None:
-        """
-        Resolve and validate a real URL from a web grounding chunk using an HTTP HEAD request.
-
-        Args:
-            session (httpx.AsyncClient): Active async HTTP client.
-            chunk (types.WebGroundingChunk): Web chunk object from Gemini.
-
-        Returns:
-            dict: {"title": ..., "uri": ...} if valid, else None.
-        """
-        try:
-            uri = chunk.web.uri
-            title = chunk.web.title
-            resp = await session.head(uri, follow_redirects=True, timeout=5.0)
-            if resp.status_code < 400:
-                return {"title": title, "uri": str(resp.url)}
-        except Exception:
-            pass
-        return None
-
-    async def process_grounding_chunks():
-        """
-        Extracts and resolves all valid grounding URLs from Gemini's response.
-        Updates the `response["grounding_chunks"]` list.
-        """
-        if raw_response and hasattr(raw_response, "candidates"):
-            candidates = raw_response.candidates
-            if candidates and len(candidates) > 0:
-                candidate = candidates[0]
-                if (
-                    candidate and
-                    hasattr(candidate, "grounding_metadata") and
-                    candidate.grounding_metadata and
-                    hasattr(candidate.grounding_metadata, "grounding_chunks")
-                ):
-                    async with httpx.AsyncClient() as session:
-                        tasks = []
-                        for chunk in candidate.grounding_metadata.grounding_chunks:  # type: ignore
-                            if hasattr(chunk, "web") and chunk.web is not None:
-                                tasks.append(resolve_real_url(session, chunk))
-
-                        resolved = await asyncio.gather(*tasks)
-                        response["grounding_chunks"] = [r for r in resolved if r is not None]
-
-    # Step 3: Run async URL resolver
-    asyncio.run(process_grounding_chunks())
-
-    return response
+    # Read here: the pool's context reaches this thread, not the background loop
+    return _run(grounded_search(user_prompt, ACTIVE_KEY_INDEX.get()))
 
 
 # Example usage for CLI/debug
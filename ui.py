@@ -1,39 +1,111 @@
 import streamlit as st
-import d3
-from streamlit_searchbox import st_searchbox
-from streamlit_chat import message
+from agents._env import cache_dir
 from prompts_library.prompt import RISK_CATEGORIES, COMPANY_NAMES, STREAMLIT_CSS
-from collections import defaultdict
 import requests
-import datetime
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import json
+import time
 import os
+import sqlite3
+import threading
+import uuid
+from bisect import bisect_left
 from dotenv import load_dotenv
 load_dotenv()
 
-# Custom CSS for the entire app
-st.markdown(STREAMLIT_CSS, unsafe_allow_html=True)
-
 # --- Rate Limiting ---
 RATE_LIMIT = 2
+RATE_WINDOW = 86400  # seconds
+
+# Sliding-window counters live in SQLite so every tab/session from the same
+# client shares one limit (session_state is per tab)
+RATE_LIMIT_DB_NAME = "ui_rate_limit.sqlite3"
+
+@st.cache_resource
+def _rate_db():
+    db_path = cache_dir() / RATE_LIMIT_DB_NAME
+    db_path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None)
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS rl ("
+        "client_id TEXT PRIMARY KEY, curr INTEGER, prev INTEGER, window_start REAL)"
+    )
+    return conn, threading.Lock()
 
-def get_today():
-    return datetime.date.today().isoformat()
+def _client_id():
+    # Client IP is stable across tabs; fall back to the session when unknown
+    ip = getattr(st.context, "ip_address", None)
+    if ip:
+        return ip
+    return st.session_state.setdefault("client_id", uuid.uuid4().hex)
+
+def _window(conn, client_id, now):
+    # Returns (curr, prev, window_start), rolling the window forward if it expired
+    row = conn.execute(
+        "SELECT curr, prev, window_start FROM rl WHERE client_id = ?", (client_id,)
+    ).fetchone()
+    if row is None:
+        return 0, 0, now
+    curr, prev, window_start = row
+    elapsed = (now - window_start) / RATE_WINDOW
+    if elapsed >= 2:
+        return 0, 0, now
+    if elapsed >= 1:
+        return 0, curr, window_start + RATE_WINDOW
+    return curr, prev, window_start
 
 def check_rate_limit():
-    today = get_today()
-    if "api_calls" not in st.session_state:
-        st.session_state.api_calls = {today: 0}
-    elif today not in st.session_state.api_calls:
-        st.session_state.api_calls = {today: 0}
-    return st.session_state.api_calls[today] < RATE_LIMIT
+    conn, lock = _rate_db()
+    now = time.time()
+    with lock:
+        curr, prev, window_start = _window(conn, _client_id(), now)
+    weighted = prev * (1 - (now - window_start) / RATE_WINDOW) + curr
+    return weighted < RATE_LIMIT
 
 def increment_rate():
-    today = get_today()
-    st.session_state.api_calls[today] += 1
+    conn, lock = _rate_db()
+    client_id = _client_id()
+    now = time.time()
+    with lock:
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            curr, prev, window_start = _window(conn, client_id, now)
+            conn.execute(
+                "INSERT OR REPLACE INTO rl (client_id, curr, prev, window_start) VALUES (?, ?, ?, ?)",
+                (client_id, curr + 1, prev, window_start),
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
 
 # --- Utility Functions ---
-def search_company_names(searchterm: str):
-    return [s for s in COMPANY_NAMES if searchterm.lower() in s.lower()]
+@st.cache_resource
+def _company_index():
+    # (lowercased name, name) pairs sorted by lowercased name, plus their keys.
+    # Cached because ui.py re-executes on every rerun.
+    pairs = sorted((c.lower(), c) for c in COMPANY_NAMES)
+    return pairs, [low for low, _ in pairs]
+
+# Suggestions shown per keystroke
+SEARCH_RESULT_LIMIT = 50
+
+@st.cache_data(show_spinner=False, max_entries=256)
+def search_company_names(searchterm: str) -> list[str]:
+    pairs, keys = _company_index()
+    s = searchterm.lower()
+    # Prefix matches first: a contiguous run in the sorted index
+    start = bisect_left(keys, s)
+    end = start
+    while end < len(keys) and keys[end].startswith(s):
+        end += 1
+    prefix = [orig for _, orig in pairs[start:end]]
+    if len(prefix) >= SEARCH_RESULT_LIMIT:
+        return prefix[:SEARCH_RESULT_LIMIT]
+    # Then the remaining substring matches
+    rest = [orig for low, orig in pairs if s in low and not low.startswith(s)]
+    return (prefix + rest)[:SEARCH_RESULT_LIMIT]
 
 def render_risk_category_dropdown():
     selected_category = st.session_state.get("selected_risk_category", "ALL")
@@ -46,11 +118,24 @@ def render_risk_category_dropdown():
     )
     st.session_state.selected_risk_category = selected
 
+def _index_risks(agent_response):
+    # Risks grouped by category ("ALL" holds every risk), built once per response
+    cached = st.session_state.get("risk_index")
+    if cached is None or cached[0] is not agent_response:
+        risks = agent_response.get("financial_risks", [])
+        index = {}
+        for risk in risks:
+            for category in risk.get("risk_category", ()):
+                index.setdefault(category, []).append(risk)
+        index["ALL"] = risks
+        cached = st.session_state.risk_index = (agent_response, index)
+    return cached[1]
+
 def display_risks(agent_response):
     selected_category = st.session_state.get("selected_risk_category", "ALL")
-    risks = agent_response.get("financial_risks", [])
+    index = _index_risks(agent_response)
 
-    if not risks:
+    if not index["ALL"]:
         st.warning("No financial risks found.")
         return
 
@@ -59,27 +144,30 @@ def display_risks(agent_response):
     else:
         st.subheader(f"{selected_category} Risks")
 
-    shown = 0
+    risks = index.get(selected_category, [])
     for risk in risks:
-        categories = risk.get("risk_category", [])
-        if selected_category == "ALL" or selected_category in categories:
-            with st.expander(f"{risk['risk_title']}"):
-                st.markdown(f"**Description:**\n{risk['description']}")
-                st.markdown("---")
-                st.markdown(f"- **Severity:** {risk.get('severity', 'N/A')}")
-                st.markdown(f"- **Impact:** {risk.get('impact', 'N/A')}")
-                if risk.get("mitigation"):
-                    st.markdown(f"**Mitigation:**\n{risk['mitigation']}")
-                if risk.get("citations"):
-                    st.markdown("**References:**")
-                    for cite in risk["citations"]:
-                        st.markdown(f"- [{cite['title']}]({cite['url']})")
-            shown += 1
-
-    if shown == 0:
+        with st.expander(f"{risk['risk_title']}"):
+            st.markdown(f"**Description:**\n{risk['description']}")
+            st.markdown("---")
+            st.markdown(f"- **Severity:** {risk.get('severity', 'N/A')}")
+            st.markdown(f"- **Impact:** {risk.get('impact', 'N/A')}")
+            if risk.get("mitigation"):
+                st.markdown(f"**Mitigation:**\n{risk['mitigation']}")
+            if risk.get("citations"):
+                st.markdown("**References:**")
+                for cite in risk["citations"]:
+                    st.markdown(f"- [{cite['title']}]({cite['url']})")
+
+    if not risks:
         st.warning(f"No risks found in category: {selected_category}")
 
 
+@st.fragment
+def _risk_section(agent_response):
+    # Changing the category reruns only this section, not the graph or ESG report
+    render_risk_category_dropdown()
+    display_risks(agent_response)
+
 def render_esg_section(agent_response):
     esg_items = agent_response.get("esg_report", [])
     if not esg_items:
@@ -87,24 +175,24 @@ def render_esg_section(agent_response):
         return
 
     st.title("ESG Metrics Overview")
-    esg_data = defaultdict(lambda: {"points": [], "sources": []})
+    esg_data = {}
     for item in esg_items:
-        category = item.get("esg_category", "Unknown")
-        description = item.get("description", "")
-        lines = [line.strip() for line in description.split("\n") if line.strip()]
-        esg_data[category]["points"].extend(lines)
-        esg_data[category]["sources"].extend(item.get("citations", []))
+        points, sources = esg_data.setdefault(item.get("esg_category", "Unknown"), ([], []))
+        points.extend(filter(None, map(str.strip, item.get("description", "").splitlines())))
+        sources.extend(item.get("citations", ()))
 
-    for category, data in esg_data.items():
+    for category, (points, sources) in esg_data.items():
         with st.expander(category):
-            for point in data["points"]:
+            for point in points:
                 st.markdown(f"{point}")
-            if data["sources"]:
+            if sources:
                 st.markdown("\n**Citations:**")
-                for source in data["sources"]:
+                for source in sources:
                     st.markdown(f"- [{source['title']}]({source['url']})")
 
 def home_page():
+    from streamlit_searchbox import st_searchbox
+
     st.markdown("""
     <div class="header-container">
         <div class="title">InsightBestAI</div>
@@ -126,28 +214,92 @@ def home_page():
         st.session_state.current_page = "results"
         st.rerun()
 
+@st.cache_resource
+def _http_session() -> requests.Session:
+    # One pooled session per process; ui.py itself re-executes on every rerun
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=32,
+        pool_maxsize=32,
+        # Retry only failed connects: a POST that reached the backend may have
+        # started a multi-minute analysis and must not be sent twice
+        max_retries=Retry(total=2, connect=2, read=0, status=0, backoff_factor=0.5),
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+RESPONSE_TTL = 3600  # seconds a finished response is reused
+STAGE_LABELS = {
+    "esg_report": "ESG insights",
+    "financial_risks": "Financial risks",
+    "risk_graph": "Risk graph",
+}
+
+@st.cache_resource
+def _response_cache() -> dict:
+    # Finished responses per company, shared across sessions: {company: (fetched_at, response)}
+    return {}
+
+def _cached_agent_response(company: str):
+    entry = _response_cache().get(company)
+    if entry is not None and time.time() - entry[0] < RESPONSE_TTL:
+        return entry[1]
+    return None
+
+def _stream_agent_response(company: str, result: dict):
+    # Consumes the backend's SSE stream, filling `result` and yielding a progress line per stage
+    stream_url = os.getenv('API_ENDPOINT', '').rstrip('/') + '/stream'
+    with _http_session().post(
+        stream_url,
+        json={"company_name": company},
+        stream=True,
+        timeout=(3, 300)
+    ) as response:
+        response.raise_for_status()
+        event = None
+        for line in response.iter_lines(decode_unicode=True):
+            if line.startswith("event:"):
+                event = line[len("event:"):].strip()
+            elif line.startswith("data:"):
+                payload = json.loads(line[len("data:"):])
+                if event == "error":
+                    raise requests.exceptions.RequestException(payload.get("detail", "Backend error"))
+                if event == "done":
+                    now = time.time()
+                    cache = _response_cache()
+                    for key in [k for k, (fetched_at, _) in cache.items() if now - fetched_at >= RESPONSE_TTL]:
+                        cache.pop(key, None)
+                    cache[company] = (now, dict(result))
+                    return
+                result[event] = payload
+                if event in STAGE_LABELS:
+                    yield f"✅ {STAGE_LABELS[event]} ready\n\n"
+    raise requests.exceptions.RequestException("Backend stream ended before completion")
+
 def results_page():
+    import d3
+
     query = st.session_state.get('search_query', 'No query found')
 
     # Check if response already cached
     if "agent_response" not in st.session_state:
         if not check_rate_limit():
-            st.error("❌ Rate limit exceeded. Please try again tomorrow.")
+            st.error("❌ Rate limit exceeded. Please try again later.")
             return
 
-        with st.spinner("🔍 Analyzing risks and generating ESG insights... This may take a few minutes. Your Patience is highly appreciated🫡"):
+        agent_response = _cached_agent_response(query)
+        if agent_response is None:
+            st.info("🔍 Analyzing risks and generating ESG insights... This may take a few minutes. Your Patience is highly appreciated🫡")
+            agent_response = {}
             try:
-                response = requests.post(
-                    os.getenv('API_ENDPOINT'),   # type: ignore
-                    json={"company_name": query}
-                )
-                response.raise_for_status()
-                st.session_state.agent_response = response.json()
-                increment_rate()
-                st.success("✅ Risk analysis complete!")
+                st.write_stream(_stream_agent_response(query, agent_response))
             except requests.exceptions.RequestException as e:
                 st.error(f"❌ Failed to contact backend:\n{e}")
                 return
+            increment_rate()
+            st.success("✅ Risk analysis complete!")
+        st.session_state.agent_response = agent_response
 
     agent_response = st.session_state.agent_response
 
@@ -167,23 +319,24 @@ def results_page():
     </div>
     """, unsafe_allow_html=True)
 
-    render_risk_category_dropdown()
-    display_risks(agent_response)
+    _risk_section(agent_response)
     d3.get_graph(agent_response.get("risk_graph", {}))
     render_esg_section(agent_response)
 
     if st.button("← Back to Search"):
         st.session_state.current_page = "home"
-        for key in ["agent_response", "search_query", "ai_searchbox"]:
+        for key in ["agent_response", "risk_index", "search_query", "ai_searchbox"]:
             if key in st.session_state:
                 del st.session_state[key]
         st.rerun()
 
 def main():
-    if 'current_page' not in st.session_state:
-        st.session_state.current_page = "home"
-    if 'selected_risk_category' not in st.session_state:
-        st.session_state.selected_risk_category = "ALL"
+    # Custom CSS for the entire app. Streamlit drops any element a rerun does
+    # not emit again, so this cannot be skipped after the first run.
+    st.markdown(STREAMLIT_CSS, unsafe_allow_html=True)
+
+    st.session_state.setdefault('current_page', "home")
+    st.session_state.setdefault('selected_risk_category', "ALL")
 
     if st.session_state.current_page == "home":
         home_page()